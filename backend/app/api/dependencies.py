@@ -8,16 +8,15 @@ from app.core.config import settings
 from app.core.security import verify_password
 from app.db.base import get_db
 from app.db.repositories.user import UserRepository
-from app.models.user import User
-from app.schemas.user import TokenPayload
+from app.schemas.user import AuthUser, TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current user from token."""
+) -> AuthUser:
+    """Get current user from token (a cached read-only snapshot, not a session-bound User)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -36,15 +35,15 @@ async def get_current_user(
         raise credentials_exception
 
     user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
+    user = await user_repo.get_auth_snapshot(user_id)
     if user is None:
         raise credentials_exception
 
     return user
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthUser = Depends(get_current_user),
+) -> AuthUser:
     """Get current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -4,15 +4,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import create_access_token, get_password_hash
 from app.db.base import get_db
 from app.db.repositories.user import UserRepository
-from app.models.user import User
 from app.api.dependencies import get_current_active_user
-from app.schemas.user import User as UserResponse, UserCreate, Token, UserRegister
+from app.schemas.user import AuthUser, User as UserResponse, UserCreate, Token, UserRegister
 from msal import ConfidentialClientApplication
 from pydantic import BaseModel
 import requests
+import asyncio
 import os
 import logging
 
@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/register", response_model=UserResponse)
+@router.post("/register", response_model=UserResponse, response_model_exclude_none=True)
 async def register(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_db)
@@ -59,9 +59,9 @@ async def login(
     try:
         user_repo = UserRepository(db)
 
-        # Get user by email
-        user = await user_repo.get_by_email(form_data.username)
-        if not user or not verify_password(form_data.password, user.password_hash):
+        # Authenticate (password verification runs in a worker thread)
+        user = await user_repo.authenticate(form_data.username, form_data.password)
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -108,12 +108,17 @@ async def login(
             detail="Login failed"
         )
 
-@router.get("/me", response_model=UserResponse)
+@router.get("/me", response_model=UserResponse, response_model_exclude_none=True)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get current user information."""
-    return current_user
+    # The auth snapshot only carries identity; load the full row for the profile
+    user = await UserRepository(db).get_by_id(current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
 
 @router.get("/azure-config")
 async def get_azure_config():
@@ -193,7 +198,7 @@ async def azure_login(
             # Create user with Azure data using dict approach
             user_data = {
                 "email": email,
-                "password_hash": get_password_hash(os.urandom(24).hex()),
+                "password_hash": await asyncio.to_thread(get_password_hash, os.urandom(24).hex()),
                 "name": f"{graph_data.get('givenName', '')} {graph_data.get('surname', '')}".strip(),
                 "is_active": True,
                 "preferences": None
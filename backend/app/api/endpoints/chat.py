@@ -1,29 +1,57 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-import json
+from functools import lru_cache
+from typing import Dict, Tuple
+import orjson
 import logging
 
 from app.db.base import get_db
 from app.db.repositories.conversation import ConversationRepository
 from app.db.repositories.message import MessageRepository
-from app.models.user import User
 from app.api.dependencies import get_current_active_user
 from app.schemas.chat import (
-    ChatRequest, ValidateKeyRequest, ValidateKeyResponse,
+    ChatRequest, ChatResponse, ValidateKeyRequest, ValidateKeyResponse,
     ModelInfo, AvailableModelsResponse
 )
+from app.schemas.user import AuthUser
+from app.adapters.base import ModelAdapter
 from app.adapters.factory import AdapterFactory
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+def sse_frame(payload: dict) -> bytes:
+    """Encode an SSE data frame; orjson writes bytes directly, skipping str encoding."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+def build_model_info(adapter: ModelAdapter, model_id: str) -> ModelInfo:
+    """Build the API model description from adapter metadata."""
+    info = adapter.get_model_info(model_id)
+    return ModelInfo(
+        id=model_id,
+        name=info.get("name", model_id),
+        description=info.get("description", ""),
+        context_length=info.get("context_length", 4096),
+        input_cost_per_token=info.get("input_cost_per_token", 0.0),
+        output_cost_per_token=info.get("output_cost_per_token", 0.0),
+        supports_streaming=info.get("supports_streaming", True)
+    )
+
+@lru_cache(maxsize=None)
+def model_catalog(adapter: ModelAdapter) -> Tuple[bytes, Dict[str, bytes]]:
+    """Serialize an adapter's static model catalog once; returns the listing and per-model JSON."""
+    model_info_list = [build_model_info(adapter, model_id) for model_id in adapter.get_available_models()]
+    listing = AvailableModelsResponse(models=model_info_list, default_model="gpt-4o")
+    per_model = {info.id: orjson.dumps(info.model_dump()) for info in model_info_list}
+    return orjson.dumps(listing.model_dump()), per_model
+
 @router.post("/message")
 async def send_message(
     request: ChatRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Send a message and get streaming response."""
     try:
@@ -67,13 +95,15 @@ async def send_message(
                 detail=f"Invalid API key: {key_validation.get('error', 'Unknown error')}"
             )
 
-        # Create user message
+        # Persist the user message before calling the provider, so a failed turn or a client
+        # disconnect mid-stream never loses it. This costs a second commit per turn (the reply
+        # is inserted on completion); durability of the user's input is worth the round-trip.
         message_repo = MessageRepository(db)
-        user_message = await message_repo.create(
-            conversation_id=conversation.id,
-            sender="user",
-            content=request.message
-        )
+        await message_repo.create_many([{
+            "conversation_id": conversation.id,
+            "sender": "user",
+            "content": request.message
+        }], return_rows=False)
 
         # Prepare message history for context
         recent_messages = await message_repo.get_recent_messages(
@@ -90,57 +120,82 @@ async def send_message(
         # In a real implementation, you'd need to handle this differently
         messages.append({"role": "user", "content": request.message})
 
-        # Stream response
+        stream_kwargs = dict(
+            messages=messages,
+            ai_model=request.ai_model or conversation.ai_model,
+            api_key=request.api_key,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens
+        )
+
+        def ai_payload(metadata: dict) -> dict:
+            return {
+                "conversation_id": conversation.id,
+                "sender": "ai",
+                "content": metadata["full_content"],
+                "ai_model": metadata["model_used"]
+            }
+
+        def error_payload(error: str) -> dict:
+            return {
+                "conversation_id": conversation.id,
+                "sender": "ai",
+                "content": f"Error: {error}",
+                "is_error": True,
+                "error_details": {"error_type": "api_error", "error": error}
+            }
+
+        if not request.stream:
+            # Buffered mode: the adapter joins the chunks and reports them on completion
+            async for _, metadata in adapter.generate_stream(**stream_kwargs):
+                if metadata["type"] == "complete":
+                    assistant_message = (await message_repo.create_many([ai_payload(metadata)]))[0]
+                    return ChatResponse(
+                        message=metadata["full_content"],
+                        conversation_id=conversation.id,
+                        message_id=assistant_message.id,
+                        token_count=metadata["total_tokens"],
+                        cost_estimate=metadata["cost_estimate"],
+                        processing_time=metadata["processing_time"],
+                        ai_model=metadata["model_used"]
+                    )
+                if metadata["type"] == "error":
+                    await message_repo.create_many([error_payload(metadata["error"])], return_rows=False)
+                    raise HTTPException(
+                        status_code=status.HTTP_502_BAD_GATEWAY,
+                        detail=f"AI provider error: {metadata['error']}"
+                    )
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="AI provider returned no response"
+            )
+
+        # Stream response; chunks are forwarded as they arrive and the reply is persisted once at the end
         async def generate_response():
             assistant_message = None
-            full_content = ""
 
             try:
-                async for content, metadata in adapter.generate_stream(
-                    messages=messages,
-                    ai_model=request.ai_model or conversation.ai_model,
-                    api_key=request.api_key,
-                    temperature=request.temperature,
-                    max_tokens=request.max_tokens
-                ):
+                async for content, metadata in adapter.generate_stream(**stream_kwargs):
                     if metadata["type"] == "content":
-                        full_content += content
-                        yield f"data: {json.dumps({'content': content, 'type': 'chunk'})}\n\n"
+                        yield sse_frame({'content': content, 'type': 'chunk'})
 
                     elif metadata["type"] == "complete":
-                        # Create assistant message
-                        assistant_message = await message_repo.create(
-                            conversation_id=conversation.id,
-                            sender="ai",
-                            content=metadata["full_content"],
-                            ai_model=metadata["model_used"]
-                        )
-
-                        # Update conversation's last message timestamp
-                        stats = await message_repo.get_conversation_stats(conversation.id)
-                        if stats["last_message_at"]:
-                            await conversation_repo.update_last_message_time(
-                                conversation.id,
-                                last_message_at=stats["last_message_at"]
-                            )
-
-                        yield f"data: {json.dumps({'type': 'complete', 'message_id': assistant_message.id})}\n\n"
+                        assistant_message = (await message_repo.create_many([ai_payload(metadata)]))[0]
+
+                        # message_count/last_message_at are maintained by MessageRepository
+
+                        yield sse_frame({'type': 'complete', 'message_id': assistant_message.id})
 
                     elif metadata["type"] == "error":
-                        # Create error message
-                        await message_repo.create(
-                            conversation_id=conversation.id,
-                            sender="ai",
-                            content=f"Error: {metadata['error']}",
-                            is_error=True,
-                            error_details={"error_type": "api_error", "error": metadata['error']}
-                        )
+                        await message_repo.create_many([error_payload(metadata["error"])], return_rows=False)
 
-                        yield f"data: {json.dumps({'type': 'error', 'error': metadata['error']})}\n\n"
+                        yield sse_frame({'type': 'error', 'error': metadata['error']})
 
             except Exception as e:
                 logger.error(f"Error in streaming response: {str(e)}")
-                yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+                # A failed insert leaves the transaction aborted; reset it before the session is reused
+                await db.rollback()
+                yield sse_frame({'type': 'error', 'error': str(e)})
 
         return StreamingResponse(
             generate_response(),
@@ -165,7 +220,7 @@ async def send_message(
 @router.post("/validate-key", response_model=ValidateKeyResponse)
 async def validate_api_key(
     request: ValidateKeyRequest,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Validate OpenAI API key."""
     try:
@@ -194,7 +249,7 @@ async def validate_api_key(
 
 @router.get("/models", response_model=AvailableModelsResponse)
 async def get_available_models(
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Get available AI models with detailed information."""
     try:
@@ -205,26 +260,8 @@ async def get_available_models(
                 detail="AI adapter not available"
             )
 
-        models = adapter.get_available_models()
-        model_info_list = []
-
-        for model_id in models:
-            info = adapter.get_model_info(model_id)
-            model_info = ModelInfo(
-                id=model_id,
-                name=info.get("name", model_id),
-                description=info.get("description", ""),
-                context_length=info.get("context_length", 4096),
-                input_cost_per_token=info.get("input_cost_per_token", 0.0),
-                output_cost_per_token=info.get("output_cost_per_token", 0.0),
-                supports_streaming=info.get("supports_streaming", True)
-            )
-            model_info_list.append(model_info)
-
-        return AvailableModelsResponse(
-            models=model_info_list,
-            default_model="gpt-4o"
-        )
+        listing, _ = model_catalog(adapter)
+        return Response(content=listing, media_type="application/json")
 
     except Exception as e:
         logger.error(f"Error getting available models: {str(e)}")
@@ -236,7 +273,7 @@ async def get_available_models(
 @router.get("/models/{model_id}", response_model=ModelInfo)
 async def get_model_info(
     model_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Get detailed information about a specific model."""
     try:
@@ -247,22 +284,15 @@ async def get_model_info(
                 detail="AI adapter not available"
             )
 
-        if model_id not in adapter.get_available_models():
+        _, per_model = model_catalog(adapter)
+        payload = per_model.get(model_id)
+        if payload is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Model not found"
             )
 
-        info = adapter.get_model_info(model_id)
-        return ModelInfo(
-            id=model_id,
-            name=info.get("name", model_id),
-            description=info.get("description", ""),
-            context_length=info.get("context_length", 4096),
-            input_cost_per_token=info.get("input_cost_per_token", 0.0),
-            output_cost_per_token=info.get("output_cost_per_token", 0.0),
-            supports_streaming=info.get("supports_streaming", True)
-        )
+        return Response(content=payload, media_type="application/json")
 
     except HTTPException:
         raise
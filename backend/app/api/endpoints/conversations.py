@@ -1,41 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
+import msgspec
 
 from app.db.base import get_db
 from app.db.repositories.conversation import ConversationRepository
-from app.models.user import User
+from app.db.repositories.message import MessageRepository
 from app.api.dependencies import get_current_active_user
-from app.schemas.conversation import Conversation, ConversationCreate, ConversationUpdate
+from app.schemas.conversation import Conversation, ConversationCreate, ConversationUpdate, ConversationRecord
+from app.schemas.message import MessageRecord
+from app.schemas.user import AuthUser
 
 router = APIRouter()
 
+# Shared encoder; list responses bypass pydantic and encode msgspec structs directly
+json_encoder = msgspec.json.Encoder()
+
 @router.get("/", response_model=List[Conversation])
 async def get_conversations(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Get all conversations for current user."""
     conversation_repo = ConversationRepository(db)
     conversations = await conversation_repo.get_all_by_user(current_user.id)
-    return conversations
+    # One msgspec call converts the whole list in C instead of one call per row;
+    # ConversationRecord's omit_defaults leaves unset optional fields off the wire
+    records = msgspec.convert(conversations, List[ConversationRecord], from_attributes=True)
+    return Response(content=json_encoder.encode(records), media_type="application/json")
 
-@router.post("/", response_model=Conversation, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=Conversation, response_model_exclude_none=True, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
     data: ConversationCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Create a new conversation."""
     conversation_repo = ConversationRepository(db)
     conversation = await conversation_repo.create(data, current_user.id)
     return conversation
 
-@router.get("/{conversation_id}", response_model=Conversation)
+@router.get("/{conversation_id}", response_model=Conversation, response_model_exclude_none=True)
 async def get_conversation(
     conversation_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Get a specific conversation."""
     conversation_repo = ConversationRepository(db)
@@ -49,12 +59,37 @@ async def get_conversation(
     
     return conversation
 
-@router.patch("/{conversation_id}", response_model=Conversation)
+@router.get("/{conversation_id}/messages")
+async def get_conversation_messages(
+    conversation_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthUser = Depends(get_current_active_user)
+):
+    """Stream a conversation's messages as newline-delimited JSON."""
+    conversation_repo = ConversationRepository(db)
+    conversation = await conversation_repo.get_by_id(conversation_id, current_user.id)
+
+    if not conversation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation not found"
+        )
+
+    message_repo = MessageRepository(db)
+
+    async def generate_ndjson():
+        # Serialize each row as it arrives so memory stays flat for long chats
+        async for message in message_repo.get_by_conversation_stream(conversation.id):
+            yield json_encoder.encode(MessageRecord.from_orm(message)) + b"\n"
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+@router.patch("/{conversation_id}", response_model=Conversation, response_model_exclude_none=True)
 async def update_conversation(
     conversation_id: int,
     data: ConversationUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Update conversation metadata."""
     conversation_repo = ConversationRepository(db)
@@ -72,7 +107,7 @@ async def update_conversation(
 async def delete_conversation(
     conversation_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthUser = Depends(get_current_active_user)
 ):
     """Delete a conversation."""
     conversation_repo = ConversationRepository(db)
@@ -37,6 +37,15 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_PER_HOUR: int = 1000
 
+    # Server workers; each is a separate process with its own DB pool, so the database
+    # sees up to WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+    # Database pool settings (per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_MIN: int = int(os.getenv("DB_POOL_MIN", "5"))  # Connections opened at startup
+
     # Security settings
     MAX_MESSAGE_LENGTH: int = 10000
     MAX_CONVERSATION_HISTORY: int = 100
@@ -111,8 +120,14 @@ class Settings(BaseSettings):
     @property
     def DATABASE_URL(self) -> str:
         """Get async database URL from environment."""
-        env_url = os.getenv("DATABASE_URL")
-        if env_url and env_url.strip():  # Check for non-empty string
+        # Strip once; an all-whitespace value counts as unset
+        env_url = (os.getenv("DATABASE_URL") or "").strip()
+        if env_url:
+            # Force the asyncpg driver even if a sync DSN was configured
+            for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+                if env_url.startswith(prefix):
+                    env_url = "postgresql+asyncpg://" + env_url[len(prefix):]
+                    break
             # DEBUG: Log database URL from environment (config.py:DATABASE_URL)
             logger.info(f"[CONFIG] DATABASE_URL from environment: {env_url}")
             return env_url
@@ -1,10 +1,13 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.pool import AsyncAdaptedQueuePool
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from typing import AsyncGenerator
+import asyncio
 import logging
+import sys
 
 from app.core.config import settings
 
@@ -14,17 +17,25 @@ logger = logging.getLogger(__name__)
 # DEBUG: Log database connection setup (base.py:engine_creation)
 database_url = settings.DATABASE_URL
 logger.info(f"[DB] Creating async engine with DATABASE_URL: {database_url}")
-logger.info(f"[DB] Engine config - pool_size: 20, max_overflow: 10, pool_timeout: 30s, pool_recycle: 1800s")
+logger.info(f"[DB] Engine config - pool_size: {settings.DB_POOL_SIZE}, max_overflow: {settings.DB_MAX_OVERFLOW}, pool_timeout: 30s, pool_recycle: 1800s")
 
 # Create async engine with connection pooling
 engine = create_async_engine(
     database_url,
     echo=True,
     poolclass=AsyncAdaptedQueuePool,
-    pool_size=20,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     pool_timeout=30,
-    pool_recycle=1800
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    connect_args={
+        # Disable PostgreSQL JIT; it only adds planning latency for our short OLTP queries
+        "server_settings": {"jit": "off"},
+        # Reuse prepared statements so repeated queries skip parse/plan
+        "statement_cache_size": 1024,  # asyncpg per-connection cache
+        "prepared_statement_cache_size": 512,  # SQLAlchemy asyncpg dialect cache
+    }
 )
 
 # Create async session factory with proper configuration
@@ -42,23 +53,58 @@ class Base(DeclarativeBase):
     pass
 
 
-class TimestampMixin:
-    """Mixin class for common timestamp fields."""
+class InternedString(TypeDecorator):
+    """String column for low-cardinality values; loaded rows share one interned str per value."""
+
+    impl = String
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        return sys.intern(value) if value is not None else None
+
+
+class CreatedAtMixin:
+    """Mixin class for the created_at timestamp.
+
+    Uses clock_timestamp() rather than now(): now() is fixed at transaction start,
+    so rows inserted in one transaction would tie on created_at.
+    """
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now(),
+        server_default=func.clock_timestamp(),
         nullable=False
     )
+
+
+class TimestampMixin(CreatedAtMixin):
+    """Mixin class for common timestamp fields."""
+
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.clock_timestamp(),
+        onupdate=func.clock_timestamp(),
         nullable=False
     )
 
+async def warm_pool(size: int) -> None:
+    """Open ``size`` pooled connections up front so early requests skip connect latency."""
+    # return_exceptions so one failed connect doesn't leak the connections that did open
+    results = await asyncio.gather(*(engine.connect() for _ in range(size)), return_exceptions=True)
+    await asyncio.gather(*(
+        result.close() for result in results if not isinstance(result, BaseException)
+    ))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async DB session."""
+    """Dependency for getting async DB session.
+
+    FastAPI caches dependencies per request, so every ``Depends(get_db)`` in a
+    request (including ``get_current_user``) receives this same session. Pass it
+    to all repositories so their statements share one pooled connection.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -1,19 +1,27 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc, asc, func
+from sqlalchemy import select, insert, update, delete, and_, or_, desc, asc, func, lambda_stmt
 from typing import List, Optional, Tuple
-from datetime import datetime
 from app.models.conversation import Conversation
 from app.schemas.conversation import ConversationCreate, ConversationUpdate, ConversationSearch
 
 class ConversationRepository:
     """Enhanced repository for conversation operations."""
 
+    # Column values applied by each non-delete bulk action
+    _BULK_ACTION_VALUES = {
+        "archive": {"is_archived": True},
+        "unarchive": {"is_archived": False},
+        "pin": {"is_pinned": True},
+        "unpin": {"is_pinned": False},
+    }
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def create(self, data: ConversationCreate, user_id: int) -> Conversation:
         """Create a new conversation."""
-        conversation = Conversation(
+        # INSERT ... RETURNING loads server defaults without a follow-up SELECT
+        stmt = insert(Conversation).values(
             title=data.title,
             user_id=user_id,
             model=data.ai_model,  # Map ai_model to model field
@@ -23,18 +31,18 @@ class ConversationRepository:
             message_count=0,
             total_tokens=0,
             estimated_cost=0.0
-        )
-        self.session.add(conversation)
+        ).returning(Conversation)
+        conversation = (await self.session.scalars(stmt)).one()
         await self.session.commit()
-        await self.session.refresh(conversation)
         return conversation
     
     async def get_by_id(self, conversation_id: int, user_id: int) -> Optional[Conversation]:
         """Get conversation by ID for a specific user."""
-        query = select(Conversation).where(
+        # lambda_stmt caches the compiled SQL; closure variables become bind params
+        query = lambda_stmt(lambda: select(Conversation).where(
             Conversation.id == conversation_id,
             Conversation.user_id == user_id
-        )
+        ))
         result = await self.session.execute(query)
         return result.scalars().first()
     
@@ -79,27 +87,10 @@ class ConversationRepository:
         await self.session.commit()
         return True
 
-    async def update_last_message_time(
-        self,
-        conversation_id: int,
-        last_message_at: datetime
-    ) -> Optional[Conversation]:
-        """Update conversation's last message timestamp."""
-        conversation = await self.get_by_id_admin(conversation_id)
-        if not conversation:
-            return None
-
-        conversation.last_message_at = last_message_at
-        conversation.updated_at = datetime.now()
-
-        await self.session.commit()
-        await self.session.refresh(conversation)
-        return conversation
-
     async def get_by_id_admin(self, conversation_id: int) -> Optional[Conversation]:
         """Get conversation by ID (admin access, no user restriction)."""
         result = await self.session.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
+            lambda_stmt(lambda: select(Conversation).where(Conversation.id == conversation_id))
         )
         return result.scalar_one_or_none()
 
@@ -126,8 +117,8 @@ class ConversationRepository:
         if search_params.date_to:
             query = query.where(Conversation.created_at <= search_params.date_to)
 
-        # Note: message_count filtering removed as this field doesn't exist in the database schema
-        # If needed, this would require a subquery to count messages from the messages table
+        # Note: ConversationSearch has no message_count filter; the column is maintained by
+        # MessageRepository (backfilled in migration e6f0b2c4d8a3) if one is added
 
         # Get total count
         count_query = select(func.count()).select_from(query.subquery())
@@ -151,30 +142,22 @@ class ConversationRepository:
         return conversations, total
 
     async def bulk_action(self, conversation_ids: List[int], user_id: int, action: str) -> int:
-        """Perform bulk action on conversations."""
-        query = select(Conversation).where(
-            and_(
-                Conversation.id.in_(conversation_ids),
-                Conversation.user_id == user_id
-            )
+        """Perform bulk action on conversations with a single UPDATE/DELETE."""
+        criteria = and_(
+            Conversation.id.in_(conversation_ids),
+            Conversation.user_id == user_id
         )
-        result = await self.session.execute(query)
-        conversations = result.scalars().all()
 
-        updated_count = 0
-        for conversation in conversations:
-            if action == "archive":
-                conversation.is_archived = True
-            elif action == "unarchive":
-                conversation.is_archived = False
-            elif action == "pin":
-                conversation.is_pinned = True
-            elif action == "unpin":
-                conversation.is_pinned = False
-            elif action == "delete":
-                await self.session.delete(conversation)
-
-            updated_count += 1
+        # Action is invariant across the batch, so pick the statement once
+        if action == "delete":
+            # Messages are removed by the ON DELETE CASCADE foreign key
+            stmt = delete(Conversation).where(criteria)
+        else:
+            values = self._BULK_ACTION_VALUES.get(action)
+            if values is None:
+                return 0
+            stmt = update(Conversation).where(criteria).values(**values)
 
+        result = await self.session.execute(stmt.execution_options(synchronize_session=False))
         await self.session.commit()
-        return updated_count
+        return result.rowcount
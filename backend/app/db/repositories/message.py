@@ -1,8 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
-from typing import List, Optional
-import hashlib
+from sqlalchemy import select, insert, update, desc, func, lambda_stmt
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from app.models.conversation import Conversation
 from app.models.message import Message
 
 class MessageRepository:
@@ -21,28 +21,82 @@ class MessageRepository:
         error_details: Optional[dict] = None
     ) -> Message:
         """Create a new message."""
-        # Create content hash for deduplication
-        content_hash = hashlib.sha256(content.encode()).hexdigest()
-
-        message = Message(
+        # INSERT ... RETURNING loads server defaults (and the generated content_hash) without a follow-up SELECT
+        stmt = insert(Message).values(
             conversation_id=conversation_id,
             sender=sender,
             content=content,
-            content_hash=content_hash,
             ai_model=ai_model,
             is_error=is_error,
             error_details=error_details
-        )
+        ).returning(Message)
+        message = (await self.session.scalars(stmt)).one()
 
-        self.session.add(message)
+        await self._bump_conversation_stats(conversation_id, 1)
         await self.session.commit()
-        await self.session.refresh(message)
         return message
+
+    async def create_many(
+        self,
+        payloads: List[Dict[str, Any]],
+        return_rows: bool = True
+    ) -> List[Message]:
+        """Create several messages in one INSERT and a single commit.
+
+        Each payload takes the same keys as ``create``; all rows cost one
+        round-trip and one commit. Pass ``return_rows=False`` when the caller discards the result to skip
+        RETURNING entirely (an empty list is returned).
+        """
+        rows = [
+            {
+                "conversation_id": payload["conversation_id"],
+                "sender": payload["sender"],
+                "content": payload["content"],
+                "ai_model": payload.get("ai_model"),
+                "is_error": payload.get("is_error", False),
+                "error_details": payload.get("error_details"),
+            }
+            for payload in payloads
+        ]
+        if not rows:
+            return []
+
+        if return_rows:
+            stmt = insert(Message).returning(Message, sort_by_parameter_order=True)
+            messages = list((await self.session.scalars(stmt, rows)).all())
+        else:
+            # Plain executemany; asyncpg batches the rows without a RETURNING clause
+            await self.session.execute(insert(Message), rows)
+            messages = []
+
+        added_per_conversation: Dict[int, int] = {}
+        for row in rows:
+            conversation_id = row["conversation_id"]
+            added_per_conversation[conversation_id] = added_per_conversation.get(conversation_id, 0) + 1
+        for conversation_id, added in added_per_conversation.items():
+            await self._bump_conversation_stats(conversation_id, added)
+
+        await self.session.commit()
+        return messages
+
+    async def _bump_conversation_stats(self, conversation_id: int, added: int) -> None:
+        """Maintain the conversation's materialized counters in the current transaction."""
+        await self.session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(
+                message_count=func.coalesce(Conversation.message_count, 0) + added,
+                last_message_at=func.clock_timestamp(),  # Same clock as messages.created_at
+                updated_at=func.clock_timestamp()
+            )
+            .execution_options(synchronize_session=False)
+        )
     
     async def get_by_id(self, message_id: int) -> Optional[Message]:
         """Get message by ID."""
+        # lambda_stmt caches the compiled SQL; closure variables become bind params
         result = await self.session.execute(
-            select(Message).where(Message.id == message_id)
+            lambda_stmt(lambda: select(Message).where(Message.id == message_id))
         )
         return result.scalar_one_or_none()
 
@@ -63,21 +117,16 @@ class MessageRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
-    async def get_conversation_stats(self, conversation_id: int) -> dict:
-        """Get statistics for a conversation."""
-        result = await self.session.execute(
-            select(
-                func.count(Message.id).label('message_count'),
-                func.max(Message.created_at).label('last_message_at')
-            ).where(Message.conversation_id == conversation_id)
-        )
+    async def get_by_conversation_stream(self, conversation_id: int) -> AsyncIterator[Message]:
+        """Stream messages for a conversation without buffering the full result."""
+        query = select(Message).where(
+            Message.conversation_id == conversation_id
+        ).order_by(Message.created_at)
+
+        result = await self.session.stream_scalars(query)
+        async for message in result:
+            yield message
 
-        stats = result.first()
-        return {
-            'message_count': stats.message_count or 0,
-            'last_message_at': stats.last_message_at
-        }
-    
     async def delete_by_conversation(self, conversation_id: int) -> int:
         """Delete all messages for a conversation."""
         result = await self.session.execute(
@@ -88,6 +137,12 @@ class MessageRepository:
         for message in messages:
             await self.session.delete(message)
 
+        await self.session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(message_count=0, last_message_at=None)
+            .execution_options(synchronize_session=False)
+        )
         await self.session.commit()
         return len(messages)
 
@@ -1,57 +1,88 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, lambda_stmt
 from typing import Optional, Dict, Any, Union
 from datetime import datetime
+import asyncio
+from cachetools import TTLCache
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import AuthUser, UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
 
 class UserRepository:
     """Repository for user operations."""
-    
+
+    # Per-process cache of AuthUser snapshots keyed by user_id. Every request that
+    # validates a JWT looks up its user, so a short TTL removes most of the SELECTs on
+    # authenticated paths. Writes pop the local entry, but other workers keep theirs
+    # until the TTL expires, so the TTL bounds how long a deactivation can go unseen.
+    _auth_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5)
+
     def __init__(self, session: AsyncSession):
         self.session = session
     
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email (case-insensitive)."""
-        query = select(User).where(func.lower(User.email) == func.lower(email))
+        # citext column: plain equality is case-insensitive and uses the unique index
+        # lambda_stmt caches the compiled SQL; closure variables become bind params
+        query = lambda_stmt(lambda: select(User).where(User.email == email))
         result = await self.session.execute(query)
         return result.scalars().first()
     
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        query = select(User).where(User.id == user_id)
+        query = lambda_stmt(lambda: select(User).where(User.id == user_id))
         result = await self.session.execute(query)
         return result.scalars().first()
+
+    async def get_auth_snapshot(self, user_id: int) -> Optional[AuthUser]:
+        """Get the authenticated user's identity (served from the TTL cache when possible).
+
+        Returns an immutable AuthUser rather than a session-bound User; use
+        get_by_id when ORM attributes or writes are needed.
+        """
+        snapshot: Optional[AuthUser] = self._auth_cache.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        query = lambda_stmt(lambda: select(User.id, User.email, User.is_active).where(User.id == user_id))
+        row = (await self.session.execute(query)).first()
+        if row is None:
+            return None
+        snapshot = AuthUser(id=row.id, email=row.email, is_active=row.is_active)
+        self._auth_cache[user_id] = snapshot
+        return snapshot
     
     async def create(self, data: Union[UserCreate, Dict[str, Any]]) -> User:
         """Create a new user."""
         if isinstance(data, dict):
             # Handle dict input - map to existing schema
-            user = User(
+            first_name, last_name = User.split_name(data.get("name", ""))
+            values = dict(
                 email=data["email"].lower(),  # Store email in lowercase for consistency
                 hashed_password=data.get("password_hash", data.get("hashed_password", "")),
+                first_name=first_name,
+                last_name=last_name,
                 is_active=data.get("is_active", True),
                 is_verified=data.get("is_verified", False),
                 role=data.get("role", "user")
             )
-            # Set name using the property setter
-            user.name = data.get("name", "")
         else:
-            # Handle UserCreate schema
-            user = User(
+            # Handle UserCreate schema - hash off the event loop (bcrypt is CPU-bound)
+            hashed_password = await asyncio.to_thread(get_password_hash, data.password)
+            first_name, last_name = User.split_name(data.name)
+            values = dict(
                 email=data.email.lower(),  # Store email in lowercase for consistency
-                hashed_password=get_password_hash(data.password),
+                hashed_password=hashed_password,
+                first_name=first_name,
+                last_name=last_name,
                 is_active=True,
                 is_verified=False,
                 role="user"
             )
-            # Set name using the property setter
-            user.name = data.name
 
-        self.session.add(user)
+        # INSERT ... RETURNING loads server defaults without a follow-up SELECT
+        user = (await self.session.scalars(insert(User).values(**values).returning(User))).one()
         await self.session.commit()
-        await self.session.refresh(user)
         return user
     
     async def update(self, user_id: int, data: UserUpdate) -> Optional[User]:
@@ -64,7 +95,9 @@ class UserRepository:
 
         # Hash password if provided
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+            update_data["hashed_password"] = await asyncio.to_thread(
+                get_password_hash, update_data.pop("password")
+            )
 
         # Ensure email is stored in lowercase for consistency
         if "email" in update_data:
@@ -74,6 +107,7 @@ class UserRepository:
             setattr(user, key, value)
         
         await self.session.commit()
+        self._auth_cache.pop(user_id, None)  # Next auth lookup reloads the committed row
         await self.session.refresh(user)
         return user
     
@@ -82,7 +116,8 @@ class UserRepository:
         user = await self.get_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        # bcrypt verification is CPU-bound; keep it off the event loop
+        if not await asyncio.to_thread(verify_password, password, user.hashed_password):
             return None
         return user
 
@@ -94,5 +129,6 @@ class UserRepository:
 
         user.last_login = datetime.now()
         await self.session.commit()
+        self._auth_cache.pop(user_id, None)  # Next auth lookup reloads the committed row
         await self.session.refresh(user)
         return user
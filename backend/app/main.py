@@ -1,14 +1,30 @@
-from fastapi import FastAPI, Request
+"""FastAPI application entry point.
+
+All route handlers must be ``async def``. The app is I/O-bound (database and
+upstream LLM calls), and FastAPI runs plain ``def`` endpoints on AnyIO's small
+shared threadpool, where bursts queue behind each other. A startup check warns
+about any sync endpoint, and the threadpool is capped at the DB pool size so
+sync fallbacks can't oversubscribe database connections.
+"""
+from fastapi import FastAPI, Request, Response
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+import anyio.to_thread
+import asyncio
+import importlib
+import inspect
+import orjson
+import queue
 import uvicorn
 import logging
+import os
 
 from app.api.router import api_router
 from app.core.config import settings
-
-# Import models to ensure they are registered
-from app.models import User, Conversation, Message
+from app.db.base import warm_pool
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -16,99 +32,191 @@ logger = logging.getLogger(__name__)
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse  # orjson encodes straight to bytes
 )
 
-# DEBUG: Log FastAPI app initialization (main.py:app_creation)
-logger.info(f"[MAIN] FastAPI app created: {settings.PROJECT_NAME}")
-logger.info(f"[MAIN] OpenAPI URL: {settings.API_V1_STR}/openapi.json")
+# Set up CORS - precomputed once; frozenset gives O(1) origin checks
+cors_origins = frozenset(settings.CORS_ORIGINS)
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+CORS_ALLOW_HEADERS = ("authorization", "content-type", "accept", "cache-control")
+
+@app.on_event("startup")
+async def start_log_queue():
+    """Route log records through a queue so handler I/O happens off the event loop."""
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    if not handlers:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    # The listener thread does the actual (blocking) writes to the original handlers
+    app.state.log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    app.state.log_listener.start()
+
+@app.on_event("shutdown")
+async def stop_log_queue():
+    """Flush and stop the log queue listener."""
+    listener = getattr(app.state, "log_listener", None)
+    if listener is not None:
+        listener.stop()
+
+@app.on_event("startup")
+async def log_app_configuration():
+    """Log app configuration once at startup instead of at import time."""
+    # DEBUG: Log FastAPI app initialization (main.py:app_creation)
+    logger.info("[MAIN] FastAPI app created: %s", settings.PROJECT_NAME)
+    logger.info("[MAIN] OpenAPI URL: %s/openapi.json", settings.API_V1_STR)
+    # DEBUG: Log CORS configuration (main.py:cors_setup)
+    logger.info("[MAIN] Setting up CORS with origins: %s", cors_origins)
+
+@app.on_event("startup")
+async def finalize_app_metadata():
+    """Ensure models are registered and build the OpenAPI schema once."""
+    # Usually already imported through the API router; this is a cheap no-op then
+    importlib.import_module("app.models")
+    # app.openapi() caches its result on app.openapi_schema for /openapi.json
+    app.openapi()
+
+@app.on_event("startup")
+async def configure_default_executor():
+    """Size the default thread pool used by asyncio.to_thread (password hashing)."""
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max_workers)
+    )
+    logger.info("[MAIN] Default executor configured with %d workers", max_workers)
+
+@app.on_event("startup")
+async def check_async_routes():
+    """Warn about sync endpoints and size AnyIO's threadpool for any that slip through."""
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not inspect.iscoroutinefunction(route.endpoint):
+            logger.warning("[MAIN] Sync endpoint %s %s runs on the threadpool; make it async", route.methods, route.path)
+
+    thread_limit = min((os.cpu_count() or 1) * 4, settings.DB_POOL_SIZE)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = thread_limit
+
+@app.on_event("startup")
+async def warm_db_pool():
+    """Pre-open database connections so the first requests don't pay setup cost."""
+    try:
+        size = min(settings.DB_POOL_MIN, settings.DB_POOL_SIZE)
+        await warm_pool(size)
+        logger.info("[MAIN] Database pool warmed with %d connections", size)
+    except Exception as e:
+        # Don't block startup if the database isn't reachable yet
+        logger.warning("[MAIN] Database pool warm-up failed: %s", e)
 
 # Add request logging middleware for debugging
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all incoming requests for debugging."""
-    origin = request.headers.get("origin", "no-origin")
+    """Log all incoming requests for debugging (DEBUG level only)."""
+    # Skip header lookups and URL building entirely unless DEBUG is enabled
+    if not logger.isEnabledFor(logging.DEBUG):
+        return await call_next(request)
+
     method = request.method
-    url = str(request.url)
+    url = request.url
 
     # DEBUG: Log all requests (main.py:request_logging)
-    logger.info(f"[REQUEST] {method} {url} from origin: {origin}")
+    logger.debug("[REQUEST] %s %s from origin: %s", method, url, request.headers.get("origin", "no-origin"))
 
     # Log specific headers for CORS debugging
     if method == "OPTIONS":
-        access_control_request_method = request.headers.get("access-control-request-method")
-        access_control_request_headers = request.headers.get("access-control-request-headers")
-        logger.info(f"[PREFLIGHT] Method: {access_control_request_method}, Headers: {access_control_request_headers}")
+        logger.debug(
+            "[PREFLIGHT] Method: %s, Headers: %s",
+            request.headers.get("access-control-request-method"),
+            request.headers.get("access-control-request-headers")
+        )
 
     response = await call_next(request)
 
     # DEBUG: Log response status (main.py:response_logging)
-    logger.info(f"[RESPONSE] {method} {url} -> {response.status_code}")
+    logger.debug("[RESPONSE] %s %s -> %s", method, url, response.status_code)
 
     return response
 
-# Set up CORS
-cors_origins = settings.CORS_ORIGINS
-# DEBUG: Log CORS configuration (main.py:cors_setup)
-logger.info(f"[MAIN] Setting up CORS with origins: {cors_origins}")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-    expose_headers=["*"],
+    allow_methods=CORS_ALLOW_METHODS,
+    allow_headers=CORS_ALLOW_HEADERS,  # Explicit list lets Starlette prebuild preflight headers
 )
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Static endpoint bodies are serialized once at import; the Response objects are
+# immutable after construction and safe to return from every request
+_API_ROOT_RESPONSE = Response(
+    content=orjson.dumps({
+        "message": "Welcome to the Uru Chatbot API",
+        "version": "1.0.0",
+        "docs_url": "/docs",
+        "health_check": f"{settings.API_V1_STR}/health",
+        "openapi_url": f"{settings.API_V1_STR}/openapi.json"
+    }),
+    media_type="application/json"
+)
+_LEGACY_ROOT_RESPONSE = Response(
+    content=orjson.dumps({
+        "message": "Uru Chatbot API - Please use /api/ for API endpoints",
+        "api_root": f"{settings.API_V1_STR}/",
+        "docs_url": "/docs"
+    }),
+    media_type="application/json"
+)
+_LEGACY_HEALTH_RESPONSE = Response(
+    content=orjson.dumps({
+        "status": "healthy",
+        "version": "1.0.0",
+        "note": "Please use /api/health for the standard health endpoint"
+    }),
+    media_type="application/json"
+)
+
 # API Root endpoint - provides API information
 @app.get(f"{settings.API_V1_STR}/")
 async def api_root():
-    return JSONResponse(
-        content={
-            "message": "Welcome to the Uru Chatbot API",
-            "version": "1.0.0",
-            "docs_url": "/docs",
-            "health_check": f"{settings.API_V1_STR}/health",
-            "openapi_url": f"{settings.API_V1_STR}/openapi.json"
-        }
-    )
+    return _API_ROOT_RESPONSE
 
-# Health check endpoint under API
+# Health check endpoint under API (dynamic timestamp, so serialized per request)
 @app.get(f"{settings.API_V1_STR}/health")
 async def health_check():
     from datetime import datetime
-    return JSONResponse(
-        content={
-            "status": "healthy",
-            "version": "1.0.0",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
-    )
+    return {
+        "status": "healthy",
+        "version": "1.0.0",
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }
 
 # Legacy root endpoint for backwards compatibility
 @app.get("/")
 async def legacy_root():
-    return JSONResponse(
-        content={
-            "message": "Uru Chatbot API - Please use /api/ for API endpoints",
-            "api_root": f"{settings.API_V1_STR}/",
-            "docs_url": "/docs"
-        }
-    )
+    return _LEGACY_ROOT_RESPONSE
 
 # Legacy health endpoint for backwards compatibility
 @app.get("/health")
 async def legacy_health_check():
-    return JSONResponse(
-        content={
-            "status": "healthy",
-            "version": "1.0.0",
-            "note": "Please use /api/health for the standard health endpoint"
-        }
-    )
+    return _LEGACY_HEALTH_RESPONSE
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    if settings.is_production:
+        # C event loop and HTTP parser; the worker count is capped by WEB_CONCURRENCY
+        # because every worker opens its own DB pool
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=settings.WEB_CONCURRENCY,
+            loop="uvloop",
+            http="httptools"
+        )
+    else:
+        uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -3,4 +3,9 @@ from .user import User
 from .conversation import Conversation
 from .message import Message
 
+from sqlalchemy.orm import configure_mappers
+
+# Configure all mappers once at import rather than lazily on the first query
+configure_mappers()
+
 __all__ = ["User", "Conversation", "Message"]
@@ -1,25 +1,32 @@
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Text, Integer, Float
+from sqlalchemy import String, Boolean, DateTime, ForeignKey, Text, Integer, Float, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
 from typing import Optional, List
 
-from app.db.base import Base, TimestampMixin
+from app.db.base import Base, InternedString, TimestampMixin
+from app.models.message import Message
 
 
 class Conversation(Base, TimestampMixin):
     """Conversation model matching existing database schema."""
 
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Serve the per-user conversation list sorts from an index range scan
+        Index("ix_conversations_user_updated", "user_id", text("updated_at DESC")),
+        Index("ix_conversations_user_last_message", "user_id", text("last_message_at DESC")),
+    )
 
     # Primary key
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
 
     # Foreign key to user
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # Conversation metadata - matching existing schema
     title: Mapped[str] = mapped_column(String(255), nullable=False)
-    model: Mapped[str] = mapped_column(String(100), nullable=False)  # Database has 'model', not 'ai_model'
+    model: Mapped[str] = mapped_column(InternedString(100, collation="C"), nullable=False)  # Database has 'model', not 'ai_model'
     system_prompt: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Organization flags
@@ -34,17 +41,20 @@ class Conversation(Base, TimestampMixin):
     # Activity tracking
     last_message_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="conversations")
+    # Relationships - lazy="raise" forces explicit selectinload()/joinedload() opt-in
+    # so list views can't silently issue one SELECT per conversation (N+1)
+    user: Mapped["User"] = relationship("User", back_populates="conversations", lazy="raise")
     messages: Mapped[List["Message"]] = relationship(
         "Message",
         back_populates="conversation",
         cascade="all, delete-orphan",
-        order_by="Message.created_at"
+        passive_deletes=True,  # ON DELETE CASCADE removes messages; don't load them to delete
+        order_by=Message.created_at,  # Direct column; no string resolution via the registry
+        lazy="raise"
     )
 
-    # Compatibility property for ai_model (frontend expects this)
-    @property
+    # Compatibility alias for ai_model (frontend expects this); hybrid so it also works in SQL
+    @hybrid_property
     def ai_model(self) -> str:
         """Compatibility property for ai_model field."""
         return self.model
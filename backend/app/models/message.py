@@ -1,42 +1,85 @@
-from sqlalchemy import String, DateTime, ForeignKey, Boolean, Text, JSON
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
-from datetime import datetime
+from sqlalchemy import String, ForeignKey, Boolean, Text, Index, LargeBinary, Computed, text
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.ext.hybrid import hybrid_property
 from typing import Optional, Dict, Any
+from enum import Enum
 
-from app.db.base import Base
+from app.db.base import Base, CreatedAtMixin, InternedString
 
 
-class Message(Base):
+class MessageSender(str, Enum):
+    """Message sender enumeration matching DATABASE_OVERVIEW.md specification."""
+    USER = "user"
+    AI = "ai"
+    SYSTEM = "system"
+
+
+# Canonical member per stored value, so loaded senders can be compared by identity
+_SENDERS_BY_VALUE: Dict[str, MessageSender] = {sender.value: sender for sender in MessageSender}
+
+
+def coerce_sender(value):
+    """Return the canonical MessageSender member for a sender string; other values pass through."""
+    return _SENDERS_BY_VALUE.get(value, value) if isinstance(value, str) else value
+
+
+class SenderType(TypeDecorator):
+    """Stores MessageSender as its plain string value and loads canonical enum members."""
+
+    impl = String(20, collation="C")
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return value.value if isinstance(value, MessageSender) else value
+
+    def process_result_value(self, value, dialect):
+        return coerce_sender(value)
+
+
+class Message(Base, CreatedAtMixin):
     """Message model for storing chat messages between user and AI model."""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Message history is always fetched per conversation in created_at order
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+        # Dedup lookups compare 32-byte digests within a conversation
+        Index(
+            "ix_messages_conversation_content_hash", "conversation_id", "content_hash",
+            postgresql_where=text("content_hash IS NOT NULL")
+        ),
+        # Containment queries on error details (e.g. error_type) use the GIN index
+        Index("ix_messages_error_details_gin", "error_details", postgresql_using="gin"),
+    )
 
     # Primary key
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
 
     # Foreign key to conversation
     conversation_id: Mapped[int] = mapped_column(ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
 
     # Message metadata
-    sender: Mapped[str] = mapped_column(String(20), nullable=False)  # user, ai, system
+    sender: Mapped[MessageSender] = mapped_column(SenderType(), nullable=False)  # user, ai, system
     content: Mapped[str] = mapped_column(Text, nullable=False)  # The actual message content
-    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # SHA-256 hash for deduplication
+    content_hash: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary(32),
+        Computed("message_content_sha256(content)", persisted=True),  # SHA-256 computed by PostgreSQL on write
+        nullable=True
+    )  # Raw SHA-256 digest for deduplication
 
     # AI-specific fields
-    ai_model: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # AI model that generated response (for AI messages)
+    ai_model: Mapped[Optional[str]] = mapped_column(InternedString(100, collation="C"), nullable=True)  # AI model that generated response (for AI messages)
 
     # Error handling
     is_error: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    error_details: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)  # Error information if message failed
-
-    # Timestamp
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    error_details: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)  # Error information if message failed
 
     # Relationships
-    conversation: Mapped["Conversation"] = relationship("Conversation", back_populates="messages")
+    conversation: Mapped["Conversation"] = relationship("Conversation", back_populates="messages", lazy="raise")
 
-    @property
+    @hybrid_property
     def model(self) -> Optional[str]:
         """Backward compatibility property for ai_model field."""
         return self.ai_model
@@ -46,20 +89,25 @@ class Message(Base):
         """Backward compatibility setter for ai_model field."""
         self.ai_model = value
 
+    @validates("sender")
+    def _canonical_sender(self, key: str, value: str) -> MessageSender:
+        """Coerce assigned senders to the canonical enum member."""
+        return coerce_sender(value)
+
     @property
     def is_user_message(self) -> bool:
         """Check if this is a user message."""
-        return self.sender == "user"
+        return self.sender is MessageSender.USER
 
     @property
     def is_ai_message(self) -> bool:
         """Check if this is an AI message."""
-        return self.sender == "ai"
+        return self.sender is MessageSender.AI
 
     @property
     def is_system_message(self) -> bool:
         """Check if this is a system message."""
-        return self.sender == "system"
+        return self.sender is MessageSender.SYSTEM
 
     def __repr__(self) -> str:
         return f"<Message(id={self.id}, conversation_id={self.conversation_id}, sender='{self.sender}')>"
@@ -1,9 +1,18 @@
 from sqlalchemy import String, Boolean, DateTime, Index, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import CITEXT
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
-from typing import Optional, List
+from functools import cached_property
+import re
+from typing import Optional, List, Tuple
 
 from app.db.base import Base, TimestampMixin
+from app.models.conversation import Conversation
+
+# Azure guest UPN: <local>_<domain>#EXT#@<tenant>, with exactly one #EXT#@ marker
+_AZURE_EXT_EMAIL_RE = re.compile(r"^(?!.*#EXT#@.*#EXT#@)([^_]*)(?:_(.*?))?#EXT#@", re.DOTALL)
 
 
 class User(Base, TimestampMixin):
@@ -12,10 +21,10 @@ class User(Base, TimestampMixin):
     __tablename__ = "users"
 
     # Primary key
-    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True)
 
     # Authentication fields - matching existing schema
-    email: Mapped[str] = mapped_column(String(255), nullable=False)
+    email: Mapped[str] = mapped_column(CITEXT, nullable=False)  # Case-insensitive; unique index ix_users_email
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
 
     # Profile fields - matching existing schema
@@ -27,13 +36,13 @@ class User(Base, TimestampMixin):
     is_verified: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
 
     # Role field from existing schema
-    role: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    role: Mapped[Optional[str]] = mapped_column(String(50, collation="C"), nullable=True)
 
     # Activity tracking
     last_login: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Properties to maintain compatibility with the expected interface
-    @property
+    @hybrid_property
     def password_hash(self) -> str:
         """Compatibility property for password_hash."""
         return self.hashed_password
@@ -45,26 +54,32 @@ class User(Base, TimestampMixin):
 
     @property
     def name(self) -> str:
-        """Compatibility property for name."""
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        elif self.first_name:
-            return self.first_name
-        elif self.last_name:
-            return self.last_name
-        else:
-            return self.email
+        """Compatibility property for name (memoized until a source column changes)."""
+        cached = self.__dict__.get("_name_cache")
+        if cached is None:
+            if self.first_name and self.last_name:
+                cached = f"{self.first_name} {self.last_name}"
+            elif self.first_name:
+                cached = self.first_name
+            elif self.last_name:
+                cached = self.last_name
+            else:
+                cached = self.email
+            self.__dict__["_name_cache"] = cached
+        return cached
 
     @name.setter
     def name(self, value: str):
         """Compatibility setter for name."""
+        self.first_name, self.last_name = self.split_name(value)
+
+    @staticmethod
+    def split_name(value: Optional[str]) -> Tuple[str, str]:
+        """Split a display name into (first_name, last_name)."""
         if value:
             parts = value.split(' ', 1)
-            self.first_name = parts[0] if parts else ''
-            self.last_name = parts[1] if len(parts) > 1 else ''
-        else:
-            self.first_name = ''
-            self.last_name = ''
+            return (parts[0] if parts else '', parts[1] if len(parts) > 1 else '')
+        return ('', '')
 
     @property
     def preferences(self) -> Optional[dict]:
@@ -81,22 +96,43 @@ class User(Base, TimestampMixin):
         "Conversation",
         back_populates="user",
         cascade="all, delete-orphan",
-        order_by="Conversation.created_at.desc()"
+        passive_deletes=True,  # ON DELETE CASCADE removes conversations in the database
+        order_by=Conversation.created_at.desc(),
+        lazy="raise"  # Require explicit selectinload() to avoid N+1 queries
     )
 
 
 
-    @property
+    @cached_property
     def display_email(self) -> str:
         """Get the original email address, converting from Azure format if needed."""
-        if "#EXT#@" in self.email:
-            # Convert Azure external user format back to original email
-            # alan_uruenterprises.com#EXT#@alanuruenterprises.onmicrosoft.com -> alan@uruenterprises.com
-            parts = self.email.split("#EXT#@")
-            if len(parts) == 2:
-                original_email = parts[0].replace("_", "@", 1)  # Replace first underscore with @
-                return original_email
-        return self.email
+        # Convert Azure external user format back to original email in a single match
+        # alan_uruenterprises.com#EXT#@alanuruenterprises.onmicrosoft.com -> alan@uruenterprises.com
+        match = _AZURE_EXT_EMAIL_RE.match(self.email)
+        if match is None:
+            return self.email
+        local, domain = match.groups()
+        return local if domain is None else f"{local}@{domain}"  # First underscore becomes @
+
+    # Keys of memoized values derived from email/first_name/last_name
+    _DERIVED_CACHE_KEYS = ("_name_cache", "display_email")
+
+    def _clear_derived_cache(self) -> None:
+        """Drop memoized name/display_email so they are recomputed on next access."""
+        for key in self._DERIVED_CACHE_KEYS:
+            self.__dict__.pop(key, None)
+
+    @validates("email", "first_name", "last_name")
+    def _invalidate_derived_on_set(self, key: str, value: Optional[str]) -> Optional[str]:
+        """Invalidate memoized values whenever a source column is assigned."""
+        self._clear_derived_cache()
+        return value
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email='{self.email}', name='{self.name}')>"
+
+
+@event.listens_for(User, "refresh")
+def _clear_user_derived_cache_on_refresh(target: User, context, attrs) -> None:
+    """Column values reloaded from the database may differ from the memoized ones."""
+    target._clear_derived_cache()
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+def parse_datetime(v):
+    """Parse ISO/PostgreSQL timestamp strings with the C fromisoformat before pydantic's parser."""
+    if isinstance(v, str):
+        try:
+            # Accepts PostgreSQL's "YYYY-MM-DD HH:MM:SS.ffffff+00" text output on 3.11+
+            return datetime.fromisoformat(v)
+        except ValueError:
+            pass
+    return v
+
+
+def build_schemas(namespace: dict) -> None:
+    """Finish building any schema in a module left incomplete at class creation, so it never happens on a request."""
+    for value in list(namespace.values()):
+        if (
+            isinstance(value, type)
+            and issubclass(value, BaseModel)
+            and value.__module__ == namespace["__name__"]
+            and not value.__pydantic_complete__
+        ):
+            value.model_rebuild()
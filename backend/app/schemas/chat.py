@@ -1,23 +1,24 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Optional, List, Dict, Any
+
+from app.schemas.base import build_schemas
+
+# Stripped, non-empty text; enforced inside pydantic-core instead of a Python validator
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+Temperature = Annotated[float, Field(ge=0.0, le=2.0)]
+MaxTokens = Annotated[int, Field(gt=0, le=4096)]
 
 class ChatRequest(BaseModel):
     """Enhanced chat request schema."""
     conversation_id: int
-    message: str
+    message: NonEmptyStr
     api_key: str
     ai_model: Optional[str] = "gpt-4o"
     system_prompt: Optional[str] = None
-    temperature: Optional[float] = Field(default=0.7, ge=0.0, le=2.0)
-    max_tokens: Optional[int] = Field(default=None, gt=0, le=4096)
+    temperature: Optional[Temperature] = 0.7
+    max_tokens: Optional[MaxTokens] = None
     stream: bool = True
 
-    @validator('message')
-    def message_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Message cannot be empty')
-        return v.strip()
-
 class ChatResponse(BaseModel):
     """Enhanced chat response schema."""
     message: str
@@ -61,3 +62,6 @@ class AvailableModelsResponse(BaseModel):
     """Available models response schema."""
     models: List[ModelInfo]
     default_model: str
+
+
+build_schemas(globals())
@@ -1,11 +1,20 @@
-from pydantic import BaseModel, Field, ConfigDict, validator
-from typing import Optional, List
+import msgspec
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import Annotated, Literal, Optional, List
 from datetime import datetime
 
+from app.schemas.base import build_schemas, parse_datetime
+
+# Field constraints shared by the create and update shapes
+ConversationTitle = Annotated[str, Field(min_length=1, max_length=255)]
+ConversationModel = Annotated[str, Field(min_length=1, max_length=100)]
+PageNumber = Annotated[int, Field(ge=1)]
+PageSize = Annotated[int, Field(ge=1, le=100)]
+
 class ConversationBase(BaseModel):
     """Base conversation schema matching actual database schema."""
-    title: str = Field(..., min_length=1, max_length=255)
-    ai_model: str = Field(..., min_length=1, max_length=100)  # Frontend expects ai_model, model provides this via property
+    title: ConversationTitle
+    ai_model: ConversationModel  # Frontend expects ai_model, model provides this via property
     system_prompt: Optional[str] = None
 
 class ConversationCreate(ConversationBase):
@@ -14,8 +23,8 @@ class ConversationCreate(ConversationBase):
 
 class ConversationUpdate(BaseModel):
     """Conversation update schema."""
-    title: Optional[str] = Field(None, min_length=1, max_length=255)
-    ai_model: Optional[str] = Field(None, min_length=1, max_length=100)  # Frontend expects ai_model, model provides this via property
+    title: Optional[ConversationTitle] = None
+    ai_model: Optional[ConversationModel] = None  # Frontend expects ai_model, model provides this via property
     system_prompt: Optional[str] = None
     is_archived: Optional[bool] = None
     is_pinned: Optional[bool] = None
@@ -30,12 +39,36 @@ class ConversationInDBBase(ConversationBase):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        frozen=True,
+        revalidate_instances='never',
+        validate_default=False,
+    )
+
+    @field_validator('created_at', 'updated_at', 'last_message_at', mode='before')
+    @classmethod
+    def parse_timestamps(cls, v):
+        return parse_datetime(v)
 
 class Conversation(ConversationInDBBase):
     """Conversation schema for API responses."""
     pass
 
+class ConversationRecord(msgspec.Struct, frozen=True, gc=False, kw_only=True, omit_defaults=True):
+    """msgspec mirror of Conversation for list endpoints; field order matches the API shape."""
+    title: str
+    ai_model: str
+    system_prompt: Optional[str] = None
+    id: int
+    user_id: int
+    is_archived: bool
+    is_pinned: bool
+    last_message_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
 class ConversationListResponse(BaseModel):
     """Schema for conversation list response."""
     conversations: List[Conversation]
@@ -52,33 +85,16 @@ class ConversationSearch(BaseModel):
     is_pinned: Optional[bool] = None
     date_from: Optional[datetime] = None
     date_to: Optional[datetime] = None
-    page: int = Field(default=1, ge=1)
-    per_page: int = Field(default=20, ge=1, le=100)
-    sort_by: str = Field(default="updated_at")
-    sort_order: str = Field(default="desc")
-
-    @validator('sort_by')
-    def validate_sort_by(cls, v):
-        # Only allow fields that actually exist in the database schema
-        allowed_fields = ['created_at', 'updated_at', 'title', 'last_message_at']
-        if v not in allowed_fields:
-            raise ValueError(f'sort_by must be one of: {", ".join(allowed_fields)}')
-        return v
-
-    @validator('sort_order')
-    def validate_sort_order(cls, v):
-        if v not in ['asc', 'desc']:
-            raise ValueError('sort_order must be either "asc" or "desc"')
-        return v
+    page: PageNumber = 1
+    per_page: PageSize = 20
+    # Only allow fields that actually exist in the database schema
+    sort_by: Literal['created_at', 'updated_at', 'title', 'last_message_at'] = "updated_at"
+    sort_order: Literal['asc', 'desc'] = "desc"
 
 class BulkConversationAction(BaseModel):
     """Schema for bulk conversation actions."""
     conversation_ids: List[int]
-    action: str
+    action: Literal['archive', 'unarchive', 'delete', 'pin', 'unpin']
+
 
-    @validator('action')
-    def validate_action(cls, v):
-        allowed_actions = ['archive', 'unarchive', 'delete', 'pin', 'unpin']
-        if v not in allowed_actions:
-            raise ValueError(f'Action must be one of: {", ".join(allowed_actions)}')
-        return v
+build_schemas(globals())
@@ -1,14 +1,11 @@
-from pydantic import BaseModel, Field, ConfigDict, validator
+import msgspec
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from enum import Enum
 
-
-class MessageSender(str, Enum):
-    """Message sender enumeration matching DATABASE_OVERVIEW.md specification."""
-    USER = "user"
-    AI = "ai"
-    SYSTEM = "system"
+from app.models.message import MessageSender, coerce_sender
+from app.schemas.base import build_schemas, parse_datetime
+from app.schemas.chat import NonEmptyStr
 
 
 class MessageBase(BaseModel):
@@ -16,36 +13,31 @@ class MessageBase(BaseModel):
     sender: MessageSender
     content: str = Field(..., min_length=1)
 
+    @field_validator('sender', mode='before')
+    @classmethod
+    def intern_sender(cls, v):
+        # An enum instance skips pydantic's value lookup
+        return coerce_sender(v)
+
 
 class MessageCreate(MessageBase):
     """Schema for creating a message."""
+    content: NonEmptyStr
     conversation_id: int = Field(..., gt=0)
     ai_model: Optional[str] = Field(None, max_length=100)
     is_error: bool = False
     error_details: Optional[Dict[str, Any]] = None
 
-    @validator('content')
-    def content_not_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Message content cannot be empty')
-        return v.strip()
-
 
 class MessageUpdate(BaseModel):
     """Schema for updating a message."""
-    content: Optional[str] = Field(None, min_length=1)
+    content: Optional[NonEmptyStr] = None
     is_error: Optional[bool] = None
     error_details: Optional[Dict[str, Any]] = None
 
-    @validator('content')
-    def content_not_empty(cls, v):
-        if v is not None and (not v or not v.strip()):
-            raise ValueError('Message content cannot be empty')
-        return v.strip() if v else v
 
-
-class MessageInDBBase(MessageBase):
-    """Base schema for Message in DB."""
+class StoredMessageMixin(MessageBase):
+    """Fields and validators shared by the schemas built from stored messages."""
     id: int
     conversation_id: int
     content_hash: Optional[str] = None
@@ -54,7 +46,28 @@ class MessageInDBBase(MessageBase):
     error_details: Optional[Dict[str, Any]] = None
     created_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
+    @field_validator('content_hash', mode='before')
+    @classmethod
+    def content_hash_to_hex(cls, v):
+        # Stored as a raw 32-byte digest; exposed as hex on the API
+        return v.hex() if isinstance(v, bytes) else v
+
+    @field_validator('created_at', mode='before')
+    @classmethod
+    def parse_created_at(cls, v):
+        return parse_datetime(v)
+
+
+class MessageInDBBase(StoredMessageMixin):
+    """Base schema for Message in DB."""
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        frozen=True,
+        revalidate_instances='never',
+        validate_default=False,
+    )
 
 
 class Message(MessageInDBBase):
@@ -67,17 +80,46 @@ class MessageInDB(MessageInDBBase):
     pass
 
 
-class MessageResponse(MessageBase):
+class MessageResponse(StoredMessageMixin):
     """Schema for message API responses."""
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        frozen=True,
+        revalidate_instances='never',
+        validate_default=False,
+        protected_namespaces=(),
+    )
+
+
+class MessageRecord(msgspec.Struct, frozen=True, gc=False, kw_only=True, omit_defaults=True):
+    """msgspec mirror of MessageResponse for list and streaming endpoints."""
+    sender: MessageSender
+    content: str
     id: int
     conversation_id: int
     content_hash: Optional[str] = None
     ai_model: Optional[str] = None
-    is_error: bool = False
+    is_error: bool
     error_details: Optional[Dict[str, Any]] = None
     created_at: datetime
 
-    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+    @classmethod
+    def from_orm(cls, message) -> "MessageRecord":
+        """Build directly from ORM attributes, skipping pydantic validation."""
+        content_hash = message.content_hash
+        return cls(
+            sender=message.sender,
+            content=message.content,
+            id=message.id,
+            conversation_id=message.conversation_id,
+            content_hash=content_hash.hex() if content_hash is not None else None,
+            ai_model=message.ai_model,
+            is_error=message.is_error,
+            error_details=message.error_details,
+            created_at=message.created_at,
+        )
 
 
 class MessageList(BaseModel):
@@ -90,3 +132,6 @@ class MessageList(BaseModel):
     has_prev: bool = False
 
     model_config = ConfigDict(from_attributes=True)
+
+
+build_schemas(globals())
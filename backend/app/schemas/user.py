@@ -1,6 +1,13 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict, validator
+import msgspec
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator, model_validator
 from typing import Optional, List
 from datetime import datetime
+import re
+
+from app.schemas.base import build_schemas, parse_datetime
+
+# One C-level scan for the common case of a valid password
+_PASSWORD_RE = re.compile(r"(?=.*[A-Z])(?=.*[a-z])(?=.*\d)", re.DOTALL)
 
 class UserBase(BaseModel):
     """Base user schema matching DATABASE_OVERVIEW.md specification."""
@@ -11,10 +18,14 @@ class UserCreate(UserBase):
     """User creation schema."""
     password: str = Field(..., min_length=8, max_length=100)
 
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
+        if _PASSWORD_RE.match(v):
+            return v
+        # Slow path: non-ASCII letters/digits, or find which rule failed
         if not any(c.isupper() for c in v):
             raise ValueError('Password must contain at least one uppercase letter')
         if not any(c.islower() for c in v):
@@ -40,7 +51,18 @@ class UserInDBBase(UserBase):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        frozen=True,
+        revalidate_instances='never',
+        validate_default=False,
+    )
+
+    @field_validator('created_at', 'updated_at', 'last_login', mode='before')
+    @classmethod
+    def parse_timestamps(cls, v):
+        return parse_datetime(v)
 
 class User(UserInDBBase):
     """User schema for API responses."""
@@ -50,6 +72,12 @@ class UserInDB(UserInDBBase):
     """User schema with password hash."""
     password_hash: str
 
+class AuthUser(msgspec.Struct, frozen=True, gc=False):
+    """Read-only identity of the authenticated user, cached by UserRepository.get_auth_snapshot."""
+    id: int
+    email: str
+    is_active: Optional[bool] = None
+
 class UserLogin(BaseModel):
     """Schema for user login."""
     email: EmailStr
@@ -59,11 +87,14 @@ class UserRegister(UserCreate):
     """Schema for user registration."""
     confirm_password: str
 
-    @validator('confirm_password')
-    def passwords_match(cls, v, values):
-        if 'password' in values and v != values['password']:
+    @model_validator(mode='after')
+    def passwords_match(self):
+        # Runs once on the typed instance; identical objects need no comparison
+        if self.password is self.confirm_password:
+            return self
+        if self.password != self.confirm_password:
             raise ValueError('Passwords do not match')
-        return v
+        return self
 
 class Token(BaseModel):
     """Enhanced token schema."""
@@ -84,3 +115,6 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 # UserStats removed - not part of DATABASE_OVERVIEW.md specification
+
+
+build_schemas(globals())
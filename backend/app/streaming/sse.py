@@ -1,7 +1,12 @@
 from fastapi import Request
 from typing import AsyncIterator, Optional
 import asyncio
-import json
+import orjson
+import weakref
+
+FRAME_SUFFIX = b"\n\n"
+COMPLETE_FRAME = b"event: complete\ndata: Stream completed\n\n"
+ERROR_PREFIX = b"event: error\ndata: "
 
 class SSEResponse:
     """Server-Sent Events response handler."""
@@ -13,54 +18,57 @@ class SSEResponse:
     ):
         self.content_iterator = content_iterator
         self.event_type = event_type
+        # Encode the per-event prefix once instead of formatting it per chunk
+        self.data_prefix = f"event: {event_type}\ndata: ".encode()
     
     async def __call__(self, request: Request):
         """Generate SSE response."""
         async def event_generator():
+            prefix = self.data_prefix
+            is_disconnected = request.is_disconnected
             try:
                 # Send initial connection established message
-                yield f"event: {self.event_type}\ndata: Connection established\n\n"
+                yield prefix + b"Connection established" + FRAME_SUFFIX
                 
                 # Stream content from iterator
                 async for content in self.content_iterator:
-                    if await request.is_disconnected():
+                    if await is_disconnected():
                         break
                     
-                    # Format as SSE event
-                    # Escape newlines in content to ensure proper SSE format
-                    escaped_content = json.dumps({"content": content})
-                    yield f"event: {self.event_type}\ndata: {escaped_content}\n\n"
+                    # Format as SSE event; JSON-encoding escapes newlines in content
+                    yield prefix + orjson.dumps({"content": content}) + FRAME_SUFFIX
                 
                 # Send completion message
-                yield f"event: complete\ndata: Stream completed\n\n"
+                yield COMPLETE_FRAME
             except Exception as e:
                 # Send error message
-                error_data = json.dumps({"error": str(e)})
-                yield f"event: error\ndata: {error_data}\n\n"
+                yield ERROR_PREFIX + orjson.dumps({"error": str(e)}) + FRAME_SUFFIX
         
         return event_generator()
 
 class StreamingManager:
     """Manager for streaming connections."""
+
+    __slots__ = ("active_connections",)
     
     def __init__(self):
-        self.active_connections = {}
+        # Weak values: a request that is garbage-collected drops out without an explicit remove
+        self.active_connections: "weakref.WeakValueDictionary[str, Request]" = weakref.WeakValueDictionary()
     
-    async def register_connection(self, connection_id: str, request: Request) -> None:
+    def register_connection(self, connection_id: str, request: Request) -> None:
         """Register a new streaming connection."""
         self.active_connections[connection_id] = request
     
-    async def remove_connection(self, connection_id: str) -> None:
+    def remove_connection(self, connection_id: str) -> None:
         """Remove a streaming connection."""
-        if connection_id in self.active_connections:
-            del self.active_connections[connection_id]
+        self.active_connections.pop(connection_id, None)
     
     async def is_connected(self, connection_id: str) -> bool:
         """Check if a connection is still active."""
-        if connection_id not in self.active_connections:
+        request = self.active_connections.get(connection_id)
+        if request is None:
             return False
         
-        request = self.active_connections[connection_id]
         return not await request.is_disconnected()
     
     def get_active_connections_count(self) -> int:
@@ -6,9 +6,14 @@ Create Date: 2025-06-19 12:00:00.000000
 
 """
 from typing import Sequence, Union
+import logging
+import time
 
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
 
 # revision identifiers, used by Alembic.
 revision: str = 'a7f8b2c9d4e1'
@@ -16,6 +21,36 @@ down_revision: Union[str, None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Rows per committed batch when backfilling users during the old-schema migration
+USER_BATCH_SIZE = 10000
+
+# ACCESS EXCLUSIVE statements give up after LOCK_TIMEOUT instead of queueing behind (and
+# blocking everything behind) a long-running transaction, then retry from a savepoint
+LOCK_TIMEOUT = '2s'
+LOCK_RETRY_ATTEMPTS = 3
+LOCK_RETRY_DELAY_SECONDS = 5
+LOCK_NOT_AVAILABLE = '55P03'
+
+
+def _execute_with_lock_retry(connection, sql: str) -> None:
+    """Execute a DDL statement, retrying when it times out waiting for its table lock."""
+    for attempt in range(1, LOCK_RETRY_ATTEMPTS + 1):
+        try:
+            # A savepoint keeps the migration's transaction usable after a lock timeout
+            with connection.begin_nested():
+                connection.execute(sa.text(sql))
+            return
+        except OperationalError as e:
+            if getattr(e.orig, 'pgcode', None) != LOCK_NOT_AVAILABLE:
+                raise
+            logger.warning(
+                f"Lock timeout ({LOCK_TIMEOUT}) on attempt {attempt}/{LOCK_RETRY_ATTEMPTS}; "
+                f"check pg_stat_activity for the blocking transaction: {sql[:60]}..."
+            )
+            if attempt == LOCK_RETRY_ATTEMPTS:
+                raise
+            time.sleep(LOCK_RETRY_DELAY_SECONDS)
+
 
 def upgrade() -> None:
     """Upgrade schema - migrate existing users table and create conversations/messages tables."""
@@ -24,40 +59,70 @@ def upgrade() -> None:
     connection = op.get_bind()
     inspector = sa.inspect(connection)
 
-    if 'users' in inspector.get_table_names():
+    # Fail fast on lock waits; the backfill batches themselves may run as long as they need.
+    # Both are reset once the users ALTERs are done (see below)
+    connection.execute(sa.text(f"SET lock_timeout = '{LOCK_TIMEOUT}'"))
+    connection.execute(sa.text("SET statement_timeout = 0"))
+
+    # Batched reflection: one catalog pass for every table's columns and indexes,
+    # keyed by (schema, table); a missing key means the table does not exist
+    multi_columns = inspector.get_multi_columns()
+    multi_indexes = inspector.get_multi_indexes()
+
+    if (None, 'users') in multi_columns:
         # Table exists, check if it has old schema
-        columns = {col['name']: col for col in inspector.get_columns('users')}
+        columns = {col['name']: col for col in multi_columns[(None, 'users')]}
 
         if 'hashed_password' in columns:
             # Old schema detected, migrate it
             print("Migrating existing users table from old schema...")
 
-            # Add new columns
-            op.add_column('users', sa.Column('password_hash', sa.String(length=255), nullable=True))
-            op.add_column('users', sa.Column('name', sa.String(length=255), nullable=True))
-            op.add_column('users', sa.Column('preferences', sa.JSON(), nullable=True))
-
-            # Migrate data
-            op.execute("""
-                UPDATE users SET
-                    password_hash = hashed_password,
-                    name = COALESCE(first_name || ' ' || last_name, first_name, last_name, email)
-                WHERE password_hash IS NULL
-            """)
-
-            # Make new columns non-nullable
-            op.alter_column('users', 'password_hash', nullable=False)
-            op.alter_column('users', 'name', nullable=False)
-
-            # Drop old columns
-            op.drop_column('users', 'hashed_password')
-            op.drop_column('users', 'first_name')
-            op.drop_column('users', 'last_name')
-            op.drop_column('users', 'role')
-            op.drop_column('users', 'is_verified')
+            # The backfill below commits this ALTER and its own batches, so the migration is not
+            # atomic: if a later step fails, hashed_password is still there and a rerun resumes
+            # here. IF NOT EXISTS makes the column adds idempotent, and the backfill skips rows
+            # it already migrated.
+            # Old tables may predate updated_at; it is added without a default (metadata-only),
+            # backfilled with the other columns, and only then given its now() default
+            added_columns = [
+                "ADD COLUMN IF NOT EXISTS password_hash VARCHAR(255)",
+                "ADD COLUMN IF NOT EXISTS name VARCHAR(255)",
+                "ADD COLUMN IF NOT EXISTS preferences JSON",
+                "ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE",
+            ]
+
+            # Add new columns in one ALTER TABLE so ACCESS EXCLUSIVE is taken once
+            _execute_with_lock_retry(connection, "ALTER TABLE users " + ", ".join(added_columns))
+
+            # Migrate data in id-range batches, each committed on its own so no single
+            # statement holds row locks and WAL for the whole table
+            max_id = connection.execute(sa.text("SELECT MAX(id) FROM users")).scalar() or 0
+            with op.get_context().autocommit_block():
+                for lo in range(0, max_id + 1, USER_BATCH_SIZE):
+                    op.execute(sa.text("""
+                        UPDATE users SET
+                            password_hash = hashed_password,
+                            name = COALESCE(NULLIF(CONCAT_WS(' ', first_name, last_name), ''), email),
+                            updated_at = COALESCE(updated_at, now())
+                        WHERE password_hash IS NULL AND id >= :lo AND id < :hi
+                    """).bindparams(lo=lo, hi=lo + USER_BATCH_SIZE))
+
+            # Make new columns non-nullable and drop old columns in a single ALTER TABLE;
+            # this statement and the index below commit together, finishing the migration
+            altered_columns = [
+                "ALTER COLUMN password_hash SET NOT NULL",
+                "ALTER COLUMN name SET NOT NULL",
+                "ALTER COLUMN updated_at SET DEFAULT now()",
+                "ALTER COLUMN updated_at SET NOT NULL",
+                "DROP COLUMN hashed_password",
+                "DROP COLUMN first_name",
+                "DROP COLUMN last_name",
+                "DROP COLUMN role",
+                "DROP COLUMN is_verified",
+            ]
+            _execute_with_lock_retry(connection, "ALTER TABLE users " + ", ".join(altered_columns))
 
             # Create the case-insensitive email index if it doesn't exist
-            existing_indexes = [idx['name'] for idx in inspector.get_indexes('users')]
+            existing_indexes = {idx['name'] for idx in multi_indexes.get((None, 'users'), [])}
             if 'ix_users_email_lower' not in existing_indexes:
                 # Drop old email index if it exists
                 if 'ix_users_email' in existing_indexes:
@@ -80,65 +145,66 @@ def upgrade() -> None:
             sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
             sa.PrimaryKeyConstraint('id')
         )
-        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
         # Create case-insensitive unique index for email using PostgreSQL's LOWER() function
         op.create_index('ix_users_email_lower', 'users', [sa.text('LOWER(email)')], unique=True)
-    
-    # Create conversations table
-    op.create_table('conversations',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('user_id', sa.Integer(), nullable=False),
-        sa.Column('title', sa.String(length=255), nullable=False),
-        sa.Column('ai_model', sa.String(length=100), nullable=False),
-        sa.Column('system_prompt', sa.Text(), nullable=True),
-        sa.Column('is_archived', sa.Boolean(), nullable=False, default=False),
-        sa.Column('is_pinned', sa.Boolean(), nullable=False, default=False),
-        sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_conversations_id'), 'conversations', ['id'], unique=False)
-    
-    # Create messages table
-    op.create_table('messages',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('conversation_id', sa.Integer(), nullable=False),
-        sa.Column('sender', sa.String(length=20), nullable=False),
-        sa.Column('content', sa.Text(), nullable=False),
-        sa.Column('content_hash', sa.String(length=64), nullable=True),
-        sa.Column('ai_model', sa.String(length=100), nullable=True),
-        sa.Column('is_error', sa.Boolean(), nullable=False, default=False),
-        sa.Column('error_details', sa.JSON(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index(op.f('ix_messages_id'), 'messages', ['id'], unique=False)
 
+    # The timeouts above are session-wide; restore the defaults so later revisions in the
+    # same `alembic upgrade` run (index builds, column rewrites) wait for locks as usual
+    connection.execute(sa.text("RESET lock_timeout"))
+    connection.execute(sa.text("RESET statement_timeout"))
+
+    # Create conversations and messages in one round trip (psycopg2 accepts multi-statement
+    # strings); the primary keys provide the id indexes. Constraint names match what
+    # op.create_table would generate.
+    op.execute("""
+        CREATE TABLE conversations (
+            id SERIAL NOT NULL,
+            user_id INTEGER NOT NULL,
+            title VARCHAR(255) NOT NULL,
+            ai_model VARCHAR(100) NOT NULL,
+            system_prompt TEXT,
+            is_archived BOOLEAN NOT NULL,
+            is_pinned BOOLEAN NOT NULL,
+            last_message_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+        );
+        CREATE TABLE messages (
+            id SERIAL NOT NULL,
+            conversation_id INTEGER NOT NULL,
+            sender VARCHAR(20) NOT NULL,
+            content TEXT NOT NULL,
+            content_hash VARCHAR(64),
+            ai_model VARCHAR(100),
+            is_error BOOLEAN NOT NULL,
+            error_details JSON,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(conversation_id) REFERENCES conversations (id) ON DELETE CASCADE
+        );
+    """)
 
 def downgrade() -> None:
     """Downgrade schema - drop all tables."""
 
-    # Drop messages table if it exists
+    # Reflect once; every existence check below is a set lookup
     connection = op.get_bind()
     inspector = sa.inspect(connection)
+    tables = set(inspector.get_table_names())
 
-    if 'messages' in inspector.get_table_names():
-        op.drop_index(op.f('ix_messages_id'), table_name='messages')
+    # Drop messages table if it exists
+    if 'messages' in tables:
         op.drop_table('messages')
 
     # Drop conversations table if it exists
-    if 'conversations' in inspector.get_table_names():
-        op.drop_index(op.f('ix_conversations_id'), table_name='conversations')
+    if 'conversations' in tables:
         op.drop_table('conversations')
 
     # Drop users table if it exists
-    if 'users' in inspector.get_table_names():
-        existing_indexes = [idx['name'] for idx in inspector.get_indexes('users')]
+    if 'users' in tables:
+        existing_indexes = {idx['name'] for idx in inspector.get_indexes('users')}
         if 'ix_users_email_lower' in existing_indexes:
             op.drop_index('ix_users_email_lower', table_name='users')
-        if 'ix_users_id' in existing_indexes:
-            op.drop_index(op.f('ix_users_id'), table_name='users')
         op.drop_table('users')
@@ -0,0 +1,37 @@
+"""Use clock_timestamp() for created_at/updated_at server defaults
+
+Revision ID: a8b3c5d7e9f1
+Revises: f7a2b4c6d8e0
+Create Date: 2025-07-06 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b3c5d7e9f1'
+down_revision: Union[str, None] = 'f7a2b4c6d8e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = [
+    ('users', 'created_at'),
+    ('users', 'updated_at'),
+    ('conversations', 'created_at'),
+    ('conversations', 'updated_at'),
+    ('messages', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema - clock_timestamp() keeps rows inserted in one transaction distinct."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text('clock_timestamp()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore now() defaults."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text('now()'))
@@ -0,0 +1,60 @@
+"""Compute messages.content_hash as a generated column in PostgreSQL
+
+Revision ID: b9c4d6e8f0a2
+Revises: a8b3c5d7e9f1
+Create Date: 2025-07-07 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c4d6e8f0a2'
+down_revision: Union[str, None] = 'a8b3c5d7e9f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# convert_to() is only STABLE, so wrap it in an IMMUTABLE function that generated columns accept.
+# The UTF-8 bytes match the digests previously computed in Python with content.encode().
+CREATE_HASH_FUNCTION = """
+CREATE OR REPLACE FUNCTION message_content_sha256(content text) RETURNS bytea
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+AS $$ SELECT sha256(convert_to(content, 'UTF8')) $$
+"""
+
+
+def _create_dedup_index() -> None:
+    op.create_index(
+        'ix_messages_conversation_content_hash', 'messages',
+        ['conversation_id', 'content_hash'], unique=False,
+        postgresql_where=sa.text('content_hash IS NOT NULL')
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema - replace the app-written digest with a stored generated column."""
+    op.execute(CREATE_HASH_FUNCTION)
+    # A plain column cannot be altered into a generated one, so recreate it
+    op.drop_index('ix_messages_conversation_content_hash', table_name='messages')
+    op.drop_column('messages', 'content_hash')
+    op.add_column(
+        'messages',
+        sa.Column(
+            'content_hash', sa.LargeBinary(length=32),
+            sa.Computed('message_content_sha256(content)', persisted=True),
+            nullable=True
+        )
+    )
+    _create_dedup_index()
+
+
+def downgrade() -> None:
+    """Downgrade schema - back to a plain digest column written by the application."""
+    op.drop_index('ix_messages_conversation_content_hash', table_name='messages')
+    op.drop_column('messages', 'content_hash')
+    op.add_column('messages', sa.Column('content_hash', sa.LargeBinary(length=32), nullable=True))
+    op.execute("UPDATE messages SET content_hash = message_content_sha256(content)")
+    _create_dedup_index()
+    op.execute("DROP FUNCTION IF EXISTS message_content_sha256(text)")
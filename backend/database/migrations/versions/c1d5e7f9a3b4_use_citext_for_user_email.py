@@ -0,0 +1,40 @@
+"""Store users.email as citext with a plain unique index
+
+Revision ID: c1d5e7f9a3b4
+Revises: b9c4d6e8f0a2
+Create Date: 2025-07-08 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d5e7f9a3b4'
+down_revision: Union[str, None] = 'b9c4d6e8f0a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _drop_email_indexes() -> None:
+    connection = op.get_bind()
+    existing_indexes = {idx['name'] for idx in sa.inspect(connection).get_indexes('users')}
+    for name in ('ix_users_email_lower', 'ix_users_email'):
+        if name in existing_indexes:
+            op.drop_index(name, table_name='users')
+
+
+def upgrade() -> None:
+    """Upgrade schema - citext compares case-insensitively, so plain `email = :e` lookups use the index."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    _drop_email_indexes()
+    op.execute("ALTER TABLE users ALTER COLUMN email TYPE citext")
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema - back to varchar with the LOWER(email) functional unique index."""
+    _drop_email_indexes()
+    op.execute('ALTER TABLE users ALTER COLUMN email TYPE VARCHAR(255) COLLATE "C"')
+    op.create_index('ix_users_email_lower', 'users', [sa.text('LOWER(email)')], unique=True)
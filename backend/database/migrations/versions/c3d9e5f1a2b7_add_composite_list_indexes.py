@@ -0,0 +1,49 @@
+"""Add composite indexes for conversation list and message history queries
+
+Revision ID: c3d9e5f1a2b7
+Revises: a7f8b2c9d4e1
+Create Date: 2025-07-02 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9e5f1a2b7'
+down_revision: Union[str, None] = 'a7f8b2c9d4e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - index the per-user conversation list and per-conversation message history."""
+    # CONCURRENTLY keeps the tables writable while the indexes build; it cannot run in a transaction
+    with op.get_context().autocommit_block():
+        # Conversation list: WHERE user_id = ? ORDER BY updated_at / last_message_at DESC
+        op.create_index(
+            'ix_conversations_user_updated', 'conversations',
+            ['user_id', sa.text('updated_at DESC')], unique=False,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_conversations_user_last_message', 'conversations',
+            ['user_id', sa.text('last_message_at DESC')], unique=False,
+            postgresql_concurrently=True
+        )
+        # Message history: WHERE conversation_id = ? ORDER BY created_at; a btree scans
+        # backwards just as cheaply, so this also serves "latest N messages" queries
+        op.create_index(
+            'ix_messages_conversation_created', 'messages',
+            ['conversation_id', 'created_at'], unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop the composite indexes."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_messages_conversation_created', table_name='messages', postgresql_concurrently=True)
+        op.drop_index('ix_conversations_user_last_message', table_name='conversations', postgresql_concurrently=True)
+        op.drop_index('ix_conversations_user_updated', table_name='conversations', postgresql_concurrently=True)
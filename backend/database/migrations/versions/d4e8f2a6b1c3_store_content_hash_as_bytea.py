@@ -0,0 +1,45 @@
+"""Store messages.content_hash as a raw 32-byte digest
+
+Revision ID: d4e8f2a6b1c3
+Revises: c3d9e5f1a2b7
+Create Date: 2025-07-03 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e8f2a6b1c3'
+down_revision: Union[str, None] = 'c3d9e5f1a2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - convert hex SHA-256 strings to bytea and index them for dedup lookups."""
+    op.alter_column(
+        'messages', 'content_hash',
+        type_=sa.LargeBinary(length=32),
+        existing_type=sa.String(length=64),
+        existing_nullable=True,
+        postgresql_using="decode(content_hash, 'hex')"
+    )
+    op.create_index(
+        'ix_messages_conversation_content_hash', 'messages',
+        ['conversation_id', 'content_hash'], unique=False,
+        postgresql_where=sa.text('content_hash IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - convert digests back to hex strings."""
+    op.drop_index('ix_messages_conversation_content_hash', table_name='messages')
+    op.alter_column(
+        'messages', 'content_hash',
+        type_=sa.String(length=64),
+        existing_type=sa.LargeBinary(length=32),
+        existing_nullable=True,
+        postgresql_using="encode(content_hash, 'hex')"
+    )
@@ -0,0 +1,37 @@
+"""Drop the non-unique id indexes that duplicate the primary keys
+
+Revision ID: d5e9a1b3c7f2
+Revises: c1d5e7f9a3b4
+Create Date: 2025-07-09 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e9a1b3c7f2'
+down_revision: Union[str, None] = 'c1d5e7f9a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The PRIMARY KEY already has a unique btree on id; these only add write and WAL cost
+REDUNDANT_ID_INDEXES = [
+    ('ix_messages_id', 'messages'),
+    ('ix_conversations_id', 'conversations'),
+    ('ix_users_id', 'users'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema - drop the duplicate id indexes (absent on databases created after this change)."""
+    with op.get_context().autocommit_block():
+        for name, _ in REDUNDANT_ID_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema - recreate the id indexes."""
+    with op.get_context().autocommit_block():
+        for name, table in REDUNDANT_ID_INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} (id)")
@@ -0,0 +1,68 @@
+"""Use JSONB for messages.error_details and users.preferences
+
+Revision ID: e5f1a3b7c9d2
+Revises: d4e8f2a6b1c3
+Create Date: 2025-07-04 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f1a3b7c9d2'
+down_revision: Union[str, None] = 'd4e8f2a6b1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - convert JSON columns to JSONB and add a GIN index on error details."""
+    op.alter_column(
+        'messages', 'error_details',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='error_details::jsonb'
+    )
+    op.create_index(
+        'ix_messages_error_details_gin', 'messages', ['error_details'],
+        unique=False, postgresql_using='gin'
+    )
+
+    # users.preferences only exists on databases created by the initial migration
+    connection = op.get_bind()
+    user_columns = {col['name'] for col in sa.inspect(connection).get_columns('users')}
+    if 'preferences' in user_columns:
+        op.alter_column(
+            'users', 'preferences',
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using='preferences::jsonb'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema - convert JSONB columns back to JSON."""
+    connection = op.get_bind()
+    user_columns = {col['name'] for col in sa.inspect(connection).get_columns('users')}
+    if 'preferences' in user_columns:
+        op.alter_column(
+            'users', 'preferences',
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using='preferences::json'
+        )
+
+    op.drop_index('ix_messages_error_details_gin', table_name='messages')
+    op.alter_column(
+        'messages', 'error_details',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='error_details::json'
+    )
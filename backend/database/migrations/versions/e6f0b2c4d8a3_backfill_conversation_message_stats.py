@@ -0,0 +1,47 @@
+"""Ensure conversations.message_count exists and backfill the message stats
+
+Revision ID: e6f0b2c4d8a3
+Revises: d5e9a1b3c7f2
+Create Date: 2025-07-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f0b2c4d8a3'
+down_revision: Union[str, None] = 'd5e9a1b3c7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - MessageRepository maintains these columns on insert, so seed them from messages."""
+    # Databases built from the application schema already have message_count; migrated ones
+    # don't. last_message_at comes from the initial migration.
+    op.execute("ALTER TABLE conversations ADD COLUMN IF NOT EXISTS message_count INTEGER")
+
+    # One aggregate pass over messages
+    op.execute("""
+        UPDATE conversations AS c SET
+            message_count = s.message_count,
+            last_message_at = s.last_message_at
+        FROM (
+            SELECT conversation_id, COUNT(*) AS message_count, MAX(created_at) AS last_message_at
+            FROM messages
+            GROUP BY conversation_id
+        ) AS s
+        WHERE s.conversation_id = c.id
+    """)
+
+    # Conversations without messages
+    op.execute("""
+        UPDATE conversations AS c SET message_count = 0, last_message_at = NULL
+        WHERE NOT EXISTS (SELECT 1 FROM messages AS m WHERE m.conversation_id = c.id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop message_count; last_message_at belongs to the initial migration."""
+    op.execute("ALTER TABLE conversations DROP COLUMN IF EXISTS message_count")
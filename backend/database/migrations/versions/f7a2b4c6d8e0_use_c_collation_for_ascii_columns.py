@@ -0,0 +1,53 @@
+"""Use the C collation for ASCII identifier columns
+
+Revision ID: f7a2b4c6d8e0
+Revises: e5f1a3b7c9d2
+Create Date: 2025-07-05 12:00:00.000000
+
+"""
+from typing import Dict, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a2b4c6d8e0'
+down_revision: Union[str, None] = 'e5f1a3b7c9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, length) - equality-only ASCII columns; some only exist on older schemas
+COLLATED_COLUMNS = [
+    ('users', 'email', 255),
+    ('users', 'role', 50),
+    ('conversations', 'model', 100),
+    ('conversations', 'ai_model', 100),
+    ('messages', 'sender', 20),
+    ('messages', 'ai_model', 100),
+]
+
+
+def _set_collation(collation: str) -> None:
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    # Group by table so each table is altered (and locked/rewritten) once
+    clauses_by_table: Dict[str, List[str]] = {}
+    for table, column, length in COLLATED_COLUMNS:
+        columns = {col['name'] for col in inspector.get_columns(table)}
+        if column not in columns:
+            continue
+        clauses_by_table.setdefault(table, []).append(
+            f'ALTER COLUMN {column} TYPE VARCHAR({length}) COLLATE "{collation}"'
+        )
+    for table, clauses in clauses_by_table.items():
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+
+def upgrade() -> None:
+    """Upgrade schema - switch to byte-wise C collation (indexes on these columns are rebuilt)."""
+    _set_collation('C')
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore the database default collation."""
+    _set_collation('default')
@@ -23,5 +23,6 @@ if [ "$RELOAD_MODE" = "true" ]; then
     exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
 else
     echo "Starting FastAPI application (production mode)..."
-    exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+    # Worker count comes from WEB_CONCURRENCY (uvicorn default: 1); each worker has its own DB pool
+    exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools
 fi
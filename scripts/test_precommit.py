@@ -6,12 +6,24 @@ This script tests the pre-commit configuration by creating temporary files
 with various issues and running pre-commit hooks to ensure they work correctly.
 """
 
+import argparse
+import io
 import os
+import re
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 import shutil
+import sys
+
+# (test name, command, expected hook success or None to always pass, description)
+HookCheck = Tuple[str, List[str], Optional[bool], str]
+
+# pre-commit summary line ("check yaml......Failed") followed, with --verbose, by "- hook id: check-yaml"
+HOOK_STATUS_RE = re.compile(r"^.+?\.+(?:\([^)]*\))?(Passed|Failed|Skipped)$")
+HOOK_ID_RE = re.compile(r"^- hook id: (\S+)$")
 
 
 class PreCommitTester:
@@ -20,32 +32,114 @@ class PreCommitTester:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent
         self.test_results: List[Tuple[str, bool, str]] = []
-
-    def run_command(self, cmd: List[str], cwd: Path = None) -> Tuple[bool, str]:
-        """Run a command and return success status and output."""
+        # One temporary directory per parent; hooks filter on repo paths (^backend/, ^frontend/),
+        # so fixtures live under the matching directory rather than in the system temp dir
+        self._fixture_dirs: Dict[Path, tempfile.TemporaryDirectory] = {}
+        # Built once and shared by every subprocess instead of copying os.environ per call
+        self._env = {**os.environ, "PRE_COMMIT_COLOR": "never"}
+        # Report lines are buffered and written to stdout once by flush_output()
+        self._out = io.StringIO()
+
+    def log(self, message: str = "") -> None:
+        """Append a line to the buffered report."""
+        self._out.write(message + "\n")
+
+    def flush_output(self) -> None:
+        """Write the buffered report to stdout in one call."""
+        sys.stdout.write(self._out.getvalue())
+        sys.stdout.flush()
+        self._out = io.StringIO()
+
+    def run_command(self, cmd: List[str], cwd: Path = None, capture: bool = True) -> Tuple[bool, str]:
+        """Run a command and return success status and output (empty when capture is False)."""
+        # Pass/fail-only callers discard output, so don't pipe it into memory at all
+        output_kwargs = (
+            {"capture_output": True, "text": True} if capture
+            else {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+        )
         try:
             result = subprocess.run(
                 cmd,
                 cwd=cwd or self.project_root,
-                capture_output=True,
-                text=True,
-                timeout=60
+                env=self._env,
+                check=False,
+                timeout=60,
+                **output_kwargs
             )
+            if not capture:
+                return result.returncode == 0, ""
             return result.returncode == 0, result.stdout + result.stderr
         except subprocess.TimeoutExpired:
             return False, "Command timed out"
         except Exception as e:
             return False, str(e)
 
-    def test_python_hooks(self) -> None:
+    def write_fixture(self, parent: Path, name: str, content: bytes) -> Path:
+        """Create a fixture file in a temporary directory under parent, removed by cleanup_fixtures()."""
+        if parent not in self._fixture_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._fixture_dirs[parent] = tempfile.TemporaryDirectory(prefix=".precommit-fixtures-", dir=parent)
+        path = Path(self._fixture_dirs[parent].name) / name
+        # Binary write: no newline translation or encoding pass, byte-exact on every platform
+        path.write_bytes(content)
+        return path
+
+    def cleanup_fixtures(self) -> None:
+        """Remove all fixture directories."""
+        for fixture_dir in self._fixture_dirs.values():
+            fixture_dir.cleanup()
+        self._fixture_dirs.clear()
+
+    def run_chain(self, chain: List[HookCheck]) -> List[Tuple[str, bool, str]]:
+        """Run hook checks in order; checks in one chain share files, so they must not overlap."""
+        results = []
+        for test_name, cmd, expected, description in chain:
+            # Only the exit status is checked, so skip capturing hook output
+            success, _ = self.run_command(cmd, capture=False)
+            results.append((test_name, True if expected is None else success == expected, description))
+        return results
+
+    def run_chains(self, chains: List[List[HookCheck]]) -> None:
+        """Run independent chains concurrently; each check is a pre-commit subprocess, so threads overlap them."""
+        max_workers = min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map() yields in submission order, so the summary order stays stable
+            for results in executor.map(self.run_chain, chains):
+                self.test_results.extend(results)
+
+    @staticmethod
+    def parse_hook_statuses(output: str) -> Dict[str, str]:
+        """Map hook id -> Passed/Failed/Skipped from `pre-commit run --verbose` output."""
+        statuses: Dict[str, str] = {}
+        status = None
+        for line in output.splitlines():
+            match = HOOK_STATUS_RE.match(line)
+            if match:
+                status = match.group(1)
+                continue
+            match = HOOK_ID_RE.match(line)
+            if match and status:
+                statuses[match.group(1)] = status
+                status = None
+        return statuses
+
+    def run_batched(self, chains: List[List[HookCheck]]) -> None:
+        """Run all fixture-based checks in one pre-commit invocation instead of one bootstrap per hook."""
+        checks = [check for chain in chains for check in chain]
+        # Every check command is ["pre-commit", "run", <hook id>, "--files", <paths>...]
+        files = sorted({path for _, cmd, _, _ in checks for path in cmd[4:]})
+        success, output = self.run_command(["pre-commit", "run", "--verbose", "--files", *files])
+        statuses = self.parse_hook_statuses(output)
+        for test_name, cmd, expected, description in checks:
+            hook_success = statuses.get(cmd[2]) == "Passed"
+            self.test_results.append((test_name, True if expected is None else hook_success == expected, description))
+
+    def test_python_hooks(self) -> List[List[HookCheck]]:
         """Test Python-related hooks."""
-        print("🐍 Testing Python hooks...")
+        self.log("🐍 Testing Python hooks...")
 
         # Create a temporary Python file with issues
-        test_file = self.project_root / "backend" / "test_temp.py"
-        try:
-            with open(test_file, 'w') as f:
-                f.write("""
+        test_file = self.write_fixture(self.project_root / "backend", "test_temp.py", b"""
 # This file has intentional issues for testing
 import os,sys
 import json
@@ -63,34 +157,19 @@ class BadClass:
 unused_var = "this is unused"
 """)
 
-            # Test Ruff linting
-            success, output = self.run_command(["pre-commit", "run", "ruff", "--files", str(test_file)])
-            self.test_results.append(("Ruff linting", not success, "Should catch linting issues"))
-
-            # Test Ruff formatting
-            success, output = self.run_command(["pre-commit", "run", "ruff-format", "--files", str(test_file)])
-            self.test_results.append(("Ruff formatting", True, "Should format the file"))
+        # Lint, format and scan the same file, so they run as one ordered chain
+        return [[
+            ("Ruff linting", ["pre-commit", "run", "ruff", "--files", str(test_file)], False, "Should catch linting issues"),
+            ("Ruff formatting", ["pre-commit", "run", "ruff-format", "--files", str(test_file)], None, "Should format the file"),
+            ("Bandit security", ["pre-commit", "run", "bandit", "--files", str(test_file)], False, "Should catch security issues"),
+        ]]
 
-            # Test Bandit security scan
-            success, output = self.run_command(["pre-commit", "run", "bandit", "--files", str(test_file)])
-            self.test_results.append(("Bandit security", not success, "Should catch security issues"))
-
-        finally:
-            # Clean up
-            if test_file.exists():
-                test_file.unlink()
-
-    def test_frontend_hooks(self) -> None:
+    def test_frontend_hooks(self) -> List[List[HookCheck]]:
         """Test frontend-related hooks."""
-        print("⚛️  Testing frontend hooks...")
+        self.log("⚛️  Testing frontend hooks...")
 
         # Create a temporary TypeScript file with issues
-        test_file = self.project_root / "frontend" / "src" / "test_temp.tsx"
-        test_file.parent.mkdir(exist_ok=True)
-
-        try:
-            with open(test_file, 'w') as f:
-                f.write("""
+        test_file = self.write_fixture(self.project_root / "frontend" / "src", "test_temp.tsx", b"""
 import React from 'react';
 import {useState} from 'react';
 
@@ -104,22 +183,14 @@ return <div onClick={()=>{setCount(count+1)}}>{count}</div>;
 export default BadComponent;
 """)
 
-            # Test ESLint
-            success, output = self.run_command(["pre-commit", "run", "eslint", "--files", str(test_file)])
-            self.test_results.append(("ESLint", not success, "Should catch linting issues"))
-
-            # Test Prettier
-            success, output = self.run_command(["pre-commit", "run", "prettier", "--files", str(test_file)])
-            self.test_results.append(("Prettier", True, "Should format the file"))
-
-        finally:
-            # Clean up
-            if test_file.exists():
-                test_file.unlink()
+        return [[
+            ("ESLint", ["pre-commit", "run", "eslint", "--files", str(test_file)], False, "Should catch linting issues"),
+            ("Prettier", ["pre-commit", "run", "prettier", "--files", str(test_file)], None, "Should format the file"),
+        ]]
 
-    def test_docker_hooks(self) -> None:
+    def test_docker_hooks(self) -> List[List[HookCheck]]:
         """Test Docker-related hooks."""
-        print("🐳 Testing Docker hooks...")
+        self.log("🐳 Testing Docker hooks...")
 
         # Test existing Dockerfiles
         dockerfiles = [
@@ -129,133 +200,139 @@ export default BadComponent;
             "frontend/Dockerfile.dev"
         ]
 
-        for dockerfile in dockerfiles:
-            dockerfile_path = self.project_root / dockerfile
-            if dockerfile_path.exists():
-                success, output = self.run_command(["pre-commit", "run", "hadolint-docker", "--files", str(dockerfile_path)])
-                self.test_results.append((f"Hadolint {dockerfile}", success, "Should validate Dockerfile"))
+        # Dockerfiles are only read, so each one is an independent chain
+        return [
+            [(f"Hadolint {dockerfile}", ["pre-commit", "run", "hadolint-docker", "--files", str(self.project_root / dockerfile)], True, "Should validate Dockerfile")]
+            for dockerfile in dockerfiles
+            if (self.project_root / dockerfile).exists()
+        ]
 
-    def test_custom_hooks(self) -> None:
+    def test_custom_hooks(self) -> List[List[HookCheck]]:
         """Test custom validation hooks."""
-        print("🔧 Testing custom hooks...")
-
-        # Test MCP schema validation
-        success, output = self.run_command(["pre-commit", "run", "validate-mcp-schemas"])
-        self.test_results.append(("MCP schema validation", success, "Should validate MCP schemas"))
+        self.log("🔧 Testing custom hooks...")
 
-        # Test environment file validation
-        success, output = self.run_command(["pre-commit", "run", "validate-env-files"])
-        self.test_results.append(("Environment file validation", success, "Should validate env files"))
+        # These run on staged files (pre-commit may stash unstaged changes), so keep them in one serial chain
+        return [[
+            ("MCP schema validation", ["pre-commit", "run", "validate-mcp-schemas"], True, "Should validate MCP schemas"),
+            ("Environment file validation", ["pre-commit", "run", "validate-env-files"], True, "Should validate env files"),
+        ]]
 
-    def test_general_hooks(self) -> None:
+    def test_general_hooks(self) -> List[List[HookCheck]]:
         """Test general file hooks."""
-        print("📄 Testing general file hooks...")
+        self.log("📄 Testing general file hooks...")
 
         # Create a temporary file with trailing whitespace
-        test_file = self.project_root / "test_temp.txt"
-        try:
-            with open(test_file, 'w') as f:
-                f.write("Line with trailing spaces   \n")
-                f.write("Line without newline at end")
-
-            # Test trailing whitespace
-            success, output = self.run_command(["pre-commit", "run", "trailing-whitespace", "--files", str(test_file)])
-            self.test_results.append(("Trailing whitespace", not success, "Should fix trailing whitespace"))
+        test_file = self.write_fixture(
+            self.project_root, "test_temp.txt",
+            b"Line with trailing spaces   \nLine without newline at end"
+        )
 
-            # Test end of file fixer
-            success, output = self.run_command(["pre-commit", "run", "end-of-file-fixer", "--files", str(test_file)])
-            self.test_results.append(("End of file fixer", not success, "Should add final newline"))
+        return [[
+            ("Trailing whitespace", ["pre-commit", "run", "trailing-whitespace", "--files", str(test_file)], False, "Should fix trailing whitespace"),
+            ("End of file fixer", ["pre-commit", "run", "end-of-file-fixer", "--files", str(test_file)], False, "Should add final newline"),
+        ]]
 
-        finally:
-            # Clean up
-            if test_file.exists():
-                test_file.unlink()
-
-    def test_yaml_json_hooks(self) -> None:
+    def test_yaml_json_hooks(self) -> List[List[HookCheck]]:
         """Test YAML and JSON validation hooks."""
-        print("📋 Testing YAML/JSON hooks...")
+        self.log("📋 Testing YAML/JSON hooks...")
 
         # Test invalid YAML
-        test_yaml = self.project_root / "test_temp.yaml"
-        try:
-            with open(test_yaml, 'w') as f:
-                f.write("invalid: yaml: content:\n  - item1\n - item2")  # Invalid indentation
-
-            success, output = self.run_command(["pre-commit", "run", "check-yaml", "--files", str(test_yaml)])
-            self.test_results.append(("YAML validation", not success, "Should catch YAML syntax errors"))
-
-        finally:
-            if test_yaml.exists():
-                test_yaml.unlink()
+        test_yaml = self.write_fixture(
+            self.project_root, "test_temp.yaml",
+            b"invalid: yaml: content:\n  - item1\n - item2"  # Invalid indentation
+        )
 
         # Test invalid JSON
-        test_json = self.project_root / "test_temp.json"
-        try:
-            with open(test_json, 'w') as f:
-                f.write('{"invalid": json, "missing": "quotes"}')  # Invalid JSON
-
-            success, output = self.run_command(["pre-commit", "run", "check-json", "--files", str(test_json)])
-            self.test_results.append(("JSON validation", not success, "Should catch JSON syntax errors"))
-
-        finally:
-            if test_json.exists():
-                test_json.unlink()
+        test_json = self.write_fixture(
+            self.project_root, "test_temp.json",
+            b'{"invalid": json, "missing": "quotes"}'  # Invalid JSON
+        )
+
+        return [
+            [("YAML validation", ["pre-commit", "run", "check-yaml", "--files", str(test_yaml)], False, "Should catch YAML syntax errors")],
+            [("JSON validation", ["pre-commit", "run", "check-json", "--files", str(test_json)], False, "Should catch JSON syntax errors")],
+        ]
 
-    def run_all_tests(self) -> None:
-        """Run all pre-commit tests."""
-        print("🚀 Starting pre-commit hook tests...\n")
+    def run_all_tests(self, granular: bool = False) -> None:
+        """Run all pre-commit tests; granular runs one pre-commit process per hook for debugging."""
+        self.log("🚀 Starting pre-commit hook tests...\n")
 
         # Check if pre-commit is installed
         success, output = self.run_command(["pre-commit", "--version"])
         if not success:
-            print("❌ Pre-commit is not installed or not in PATH")
+            # Failures bypass the buffer so they appear immediately (after what was logged so far)
+            self.flush_output()
+            print("❌ Pre-commit is not installed or not in PATH", flush=True)
             return
 
-        print(f"✅ Pre-commit version: {output.strip()}\n")
+        self.log(f"✅ Pre-commit version: {output.strip()}\n")
 
-        # Run individual test suites
-        self.test_general_hooks()
-        self.test_yaml_json_hooks()
-        self.test_python_hooks()
-        self.test_frontend_hooks()
-        self.test_docker_hooks()
-        self.test_custom_hooks()
+        # Fixtures are written up front; only the pre-commit invocations run in parallel
+        try:
+            fixture_chains = [
+                *self.test_general_hooks(),
+                *self.test_yaml_json_hooks(),
+                *self.test_python_hooks(),
+                *self.test_frontend_hooks(),
+            ]
+            if granular:
+                self.run_chains(fixture_chains)
+            else:
+                self.run_batched(fixture_chains)
+        finally:
+            # Clean up
+            self.cleanup_fixtures()
+
+        # Dockerfiles are tracked files, so only hadolint runs on them (never the fixing hooks)
+        self.run_chains(self.test_docker_hooks())
+        self.run_chains(self.test_custom_hooks())
 
         # Print results
         self.print_results()
 
     def print_results(self) -> None:
         """Print test results summary."""
-        print("\n" + "="*60)
-        print("📊 PRE-COMMIT TEST RESULTS")
-        print("="*60)
+        self.log("\n" + "="*60)
+        self.log("📊 PRE-COMMIT TEST RESULTS")
+        self.log("="*60)
 
         passed = 0
         failed = 0
 
         for test_name, success, description in self.test_results:
             status = "✅ PASS" if success else "❌ FAIL"
-            print(f"{status:<10} {test_name:<30} {description}")
+            self.log(f"{status:<10} {test_name:<30} {description}")
 
             if success:
                 passed += 1
             else:
                 failed += 1
 
-        print("-"*60)
-        print(f"Total: {len(self.test_results)} | Passed: {passed} | Failed: {failed}")
+        self.log("-"*60)
+        self.log(f"Total: {len(self.test_results)} | Passed: {passed} | Failed: {failed}")
 
         if failed == 0:
-            print("\n🎉 All pre-commit hooks are working correctly!")
+            self.log("\n🎉 All pre-commit hooks are working correctly!")
         else:
-            print(f"\n⚠️  {failed} test(s) failed. This may be expected for some hooks.")
-            print("Review the results above and ensure hooks are working as intended.")
+            self.log(f"\n⚠️  {failed} test(s) failed. This may be expected for some hooks.")
+            self.log("Review the results above and ensure hooks are working as intended.")
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Test pre-commit hook configuration")
+    parser.add_argument(
+        "--granular",
+        action="store_true",
+        help="run each hook in its own pre-commit process (slower, easier to debug)"
+    )
+    args = parser.parse_args()
+
     tester = PreCommitTester()
-    tester.run_all_tests()
+    try:
+        tester.run_all_tests(granular=args.granular)
+    finally:
+        tester.flush_output()
 
 
 if __name__ == "__main__":
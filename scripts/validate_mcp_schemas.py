@@ -7,12 +7,61 @@ This script validates MCP (Model Context Protocol) tool schemas and structures
 to ensure they conform to the expected format and standards.
 """
 
+import ast
 import json
+import mmap
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 import re
 
+# The hook runs with the system interpreter, so orjson is optional; both parse from bytes and
+# orjson.JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Directories never descended into, per file type (node_modules, build directories, migrations, etc.)
+_JSON_SKIP_DIRS = frozenset({"node_modules", ".next", "build", "dist", "__pycache__", ".git", ".vscode", ".cache"})
+_PYTHON_SKIP_DIRS = frozenset({"migrations", "__pycache__", ".git", "node_modules"})
+_PYTHON_SKIP_FILES = frozenset({"__init__.py"})
+
+# Per-file results from earlier runs, relative to the scanned directory
+_CACHE_FILE = Path(".cache") / "mcp_schema_validator.json"
+# Cached results are only reused by the same version of this script
+_script_stat = os.stat(__file__)
+_VALIDATOR_KEY = f"{_script_stat.st_mtime_ns}:{_script_stat.st_size}"
+
+# Below this many uncached files, validation runs in-process; chunks amortize pickling
+_PARALLEL_MIN_FILES = 32
+_PARALLEL_CHUNKSIZE = 32
+
+# Standard HTTP methods for OpenAPI path items
+_HTTP_METHODS = frozenset({"GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"})
+
+# JSON Schema type -> (Python type, label) for enum value checks
+_ENUM_TYPE_CHECKERS = {"string": (str, "a string"), "integer": (int, "an integer")}
+
+# A schema or OpenAPI/Swagger spec must contain one of these keys; files without any are not parsed
+_SPEC_MARKERS = (b'"$schema"', b'"openapi"', b'"swagger"')
+
+# Common MCP patterns as one alternation, so each file is scanned once rather than once per
+# pattern; [^\n\r]* keeps matches on one line and bounds backtracking
+_MCP_RE = re.compile(
+    r'@tool'
+    r'|def[^\n\r]*tool[^\n\r]*\('
+    r'|class[^\n\r]*Tool[^\n\r]*:'
+    r'|mcp'
+    r'|model[^\n\r]*context[^\n\r]*protocol',
+    re.IGNORECASE
+)
+# Same patterns over raw bytes, to rule files out before decoding them
+_MCP_BYTES_RE = re.compile(_MCP_RE.pattern.encode('ascii'), re.IGNORECASE)
+
 
 class MCPSchemaValidator:
     """Validator for MCP tool schemas and structures."""
@@ -27,43 +76,53 @@ class MCPSchemaValidator:
 
         # Check required top-level fields
         required_fields = {"$schema", "type", "properties"}
-        missing_fields = required_fields - set(schema.keys())
+        missing_fields = {field for field in required_fields if field not in schema}
         if missing_fields:
             self.errors.append(f"{file_path}: Missing required fields: {missing_fields}")
             valid = False
 
         # Validate schema version
-        if "$schema" in schema:
-            schema_url = schema["$schema"]
-            if not schema_url.startswith("http://json-schema.org/"):
-                self.warnings.append(f"{file_path}: Non-standard schema URL: {schema_url}")
+        schema_url = schema.get("$schema")
+        if schema_url is not None and not schema_url.startswith("http://json-schema.org/"):
+            self.warnings.append(f"{file_path}: Non-standard schema URL: {schema_url}")
 
-        # Validate type
-        if "type" in schema and schema["type"] != "object":
-            self.warnings.append(f"{file_path}: Expected type 'object', got '{schema['type']}'")
+        # Validate type (a missing type is reported above, not here)
+        schema_type = schema.get("type", "object")
+        if schema_type != "object":
+            self.warnings.append(f"{file_path}: Expected type 'object', got '{schema_type}'")
 
         # Validate properties structure
-        if "properties" in schema:
-            self._validate_properties(schema["properties"], file_path)
+        properties = schema.get("properties")
+        if properties is not None:
+            self._validate_properties(properties, file_path)
 
         return valid
 
     def _validate_properties(self, properties: Dict[str, Any], file_path: str) -> None:
         """Validate properties section of a schema."""
-        for prop_name, prop_def in properties.items():
-            if not isinstance(prop_def, dict):
-                self.errors.append(f"{file_path}: Property '{prop_name}' must be an object")
-                continue
-
-            # Check for required type field
-            if "type" not in prop_def:
-                self.errors.append(f"{file_path}: Property '{prop_name}' missing 'type' field")
-
-            # Check for description
-            if "description" not in prop_def:
-                self.warnings.append(f"{file_path}: Property '{prop_name}' missing description")
-
-            # Validate enum values if present
+        self.errors.extend(
+            f"{file_path}: Property '{prop_name}' must be an object"
+            for prop_name, prop_def in properties.items()
+            if not isinstance(prop_def, dict)
+        )
+        objects = {prop_name: prop_def for prop_name, prop_def in properties.items() if isinstance(prop_def, dict)}
+
+        # Check for required type field
+        self.errors.extend(
+            f"{file_path}: Property '{prop_name}' missing 'type' field"
+            for prop_name, prop_def in objects.items()
+            if "type" not in prop_def
+        )
+
+        # Check for description
+        self.warnings.extend(
+            f"{file_path}: Property '{prop_name}' missing description"
+            for prop_name, prop_def in objects.items()
+            if "description" not in prop_def
+        )
+
+        # Validate enum values if present
+        for prop_name, prop_def in objects.items():
             if "enum" in prop_def and "type" in prop_def:
                 self._validate_enum(prop_def, prop_name, file_path)
 
@@ -76,119 +135,244 @@ class MCPSchemaValidator:
             self.errors.append(f"{file_path}: Property '{prop_name}' enum must be a list")
             return
 
-        # Check enum values match the declared type
-        for value in enum_values:
-            if prop_type == "string" and not isinstance(value, str):
-                self.errors.append(f"{file_path}: Property '{prop_name}' enum value '{value}' is not a string")
-            elif prop_type == "integer" and not isinstance(value, int):
-                self.errors.append(f"{file_path}: Property '{prop_name}' enum value '{value}' is not an integer")
+        # Check enum values match the declared type ("type" may also be a list of types)
+        checker = _ENUM_TYPE_CHECKERS.get(prop_type) if isinstance(prop_type, str) else None
+        if checker:
+            expected_type, type_label = checker
+            self.errors.extend(
+                f"{file_path}: Property '{prop_name}' enum value '{value}' is not {type_label}"
+                for value in enum_values
+                if not isinstance(value, expected_type)
+            )
 
     def validate_mcp_tool_function(self, func_code: str, file_path: str) -> bool:
         """Validate MCP tool function structure in Python code."""
         valid = True
 
-        # Check for function definition patterns
-        function_pattern = r'def\s+(\w+)\s*\([^)]*\)\s*:'
-        functions = re.findall(function_pattern, func_code)
+        # One parse covers definitions, docstrings and annotations, including multi-line signatures
+        try:
+            tree = ast.parse(func_code)
+        except (SyntaxError, ValueError) as e:
+            self.warnings.append(f"{file_path}: Could not parse Python source - {e}")
+            return valid
+
+        functions = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
 
         if not functions:
             self.warnings.append(f"{file_path}: No function definitions found")
             return valid
 
         # Check for docstrings
-        docstring_pattern = r'def\s+\w+\s*\([^)]*\)\s*:\s*"""[^"]*"""'
-        functions_with_docs = re.findall(docstring_pattern, func_code, re.DOTALL)
+        functions_with_docs = sum(1 for func in functions if ast.get_docstring(func))
 
-        if len(functions_with_docs) < len(functions):
+        if functions_with_docs < len(functions):
             self.warnings.append(f"{file_path}: Some functions missing docstrings")
 
-        # Check for type hints
-        typed_function_pattern = r'def\s+\w+\s*\([^)]*:\s*[^)]+\)\s*->\s*[^:]+'
-        typed_functions = re.findall(typed_function_pattern, func_code)
+        # Check for type hints; a return annotation needs "->" in the source, so skip the walk without one
+        typed_functions = sum(1 for func in functions if self._is_fully_typed(func)) if "->" in func_code else 0
 
-        if len(typed_functions) < len(functions):
+        if typed_functions < len(functions):
             self.warnings.append(f"{file_path}: Some functions missing type hints")
 
         return valid
 
+    @staticmethod
+    def _is_fully_typed(func: ast.AST) -> bool:
+        """Check a function has a return annotation and annotations on all parameters but self/cls."""
+        args = func.args
+        params = [*args.posonlyargs, *args.args, *args.kwonlyargs]
+        return func.returns is not None and all(
+            param.annotation is not None for param in params if param.arg not in ("self", "cls")
+        )
+
     def validate_openapi_spec(self, spec: Dict[str, Any], file_path: str) -> bool:
         """Validate OpenAPI specification structure."""
         valid = True
 
         # Check required OpenAPI fields
         required_fields = {"openapi", "info", "paths"}
-        missing_fields = required_fields - set(spec.keys())
+        missing_fields = {field for field in required_fields if field not in spec}
         if missing_fields:
             self.errors.append(f"{file_path}: Missing required OpenAPI fields: {missing_fields}")
             valid = False
 
         # Validate OpenAPI version
-        if "openapi" in spec:
-            version = spec["openapi"]
-            if not version.startswith("3."):
-                self.warnings.append(f"{file_path}: OpenAPI version should be 3.x, got {version}")
+        version = spec.get("openapi")
+        if version is not None and not version.startswith("3."):
+            self.warnings.append(f"{file_path}: OpenAPI version should be 3.x, got {version}")
 
         # Validate paths
-        if "paths" in spec:
-            for path, methods in spec["paths"].items():
+        paths = spec.get("paths")
+        if paths is not None:
+            for path, methods in paths.items():
                 if not path.startswith("/"):
                     self.errors.append(f"{file_path}: Path '{path}' should start with '/'")
                     valid = False
 
-                for method, operation in methods.items():
-                    if method.upper() not in ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]:
-                        self.warnings.append(f"{file_path}: Unusual HTTP method '{method}' for path '{path}'")
+                self.warnings.extend(
+                    f"{file_path}: Unusual HTTP method '{method}' for path '{path}'"
+                    for method in methods
+                    if method.upper() not in _HTTP_METHODS
+                )
 
         return valid
 
+    def _walk(self, root: str, json_ok: bool = True, python_ok: bool = True) -> Iterator[Tuple[str, os.DirEntry]]:
+        """Yield ("json" | "py", entry) for files to validate, pruning skipped directories.
+
+        One os.scandir pass serves both file types; a directory is only entered while at
+        least one type is still wanted below it. Entries carry name, path and a cached
+        stat, so no Path objects are built per file.
+        """
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            return
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                sub_json_ok = json_ok and name not in _JSON_SKIP_DIRS
+                sub_python_ok = python_ok and name not in _PYTHON_SKIP_DIRS
+                if sub_json_ok or sub_python_ok:
+                    yield from self._walk(entry.path, sub_json_ok, sub_python_ok)
+            elif json_ok and name.endswith(".json"):
+                yield "json", entry
+            elif python_ok and name.endswith(".py") and name not in _PYTHON_SKIP_FILES:
+                yield "py", entry
+
+    def _validate_file(self, kind: str, file_path: str) -> Tuple[bool, bool]:
+        """Validate one file; returns (is MCP-related, valid) and appends to errors/warnings."""
+        is_mcp = False
+        valid = True
+
+        if kind == "json":
+            # JSON schema files (only MCP-related ones)
+            try:
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+
+                # A byte scan is far cheaper than json parsing; MCP-related files are still
+                # parsed so their syntax errors are reported
+                if not any(marker in raw for marker in _SPEC_MARKERS) and not self._is_mcp_related_file(file_path):
+                    return is_mcp, valid
+                data = _json_loads(raw)
+
+                data_kind = self._classify(data)
+                if data_kind == "schema":
+                    is_mcp = True
+                    if not self.validate_json_schema(data, file_path):
+                        valid = False
+                elif data_kind == "openapi" and self._is_mcp_related_openapi(data):
+                    is_mcp = True
+                    if not self.validate_openapi_spec(data, file_path):
+                        valid = False
+
+            except json.JSONDecodeError as e:
+                # Only report JSON errors for MCP-related files
+                if self._is_mcp_related_file(file_path):
+                    self.errors.append(f"{file_path}: Invalid JSON - {e}")
+                    valid = False
+            except Exception as e:
+                if self._is_mcp_related_file(file_path):
+                    self.errors.append(f"{file_path}: Error reading file - {e}")
+                    valid = False
+        else:
+            # Python files with MCP tools
+            try:
+                # Scan the mapped bytes first; most files never match and are never decoded
+                with open(file_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        return is_mcp, valid
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if _MCP_BYTES_RE.search(mm) is None:
+                            return is_mcp, valid
+
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    code = f.read()
+
+                if self._contains_mcp_tools(code):
+                    is_mcp = True
+                    if not self.validate_mcp_tool_function(code, file_path):
+                        valid = False
+
+            except Exception as e:
+                self.errors.append(f"{file_path}: Error reading file - {e}")
+                valid = False
+
+        return is_mcp, valid
+
+    def _load_cache(self, cache_path: Path) -> Dict[str, Any]:
+        """Load cached per-file results; any unreadable or outdated cache counts as empty."""
+        try:
+            with open(cache_path, 'rb') as f:
+                cache = _json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get("validator") != _VALIDATOR_KEY:
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, cache_path: Path, files: Dict[str, Any]) -> None:
+        """Write per-file results; failing to write only costs the next run a cold start."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"validator": _VALIDATOR_KEY, "files": files}, f)
+        except OSError:
+            pass
+
     def scan_directory(self, directory: Path) -> bool:
         """Scan directory for files to validate."""
         all_valid = True
         found_mcp_files = False
 
-        # Find JSON schema files (only MCP-related ones)
-        json_files = list(directory.rglob("*.json"))
-        for json_file in json_files:
-            if self._should_validate_json(json_file):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
-                    if self._is_json_schema(data):
-                        found_mcp_files = True
-                        if not self.validate_json_schema(data, str(json_file)):
-                            all_valid = False
-                    elif self._is_openapi_spec(data) and self._is_mcp_related_openapi(data):
-                        found_mcp_files = True
-                        if not self.validate_openapi_spec(data, str(json_file)):
-                            all_valid = False
-
-                except json.JSONDecodeError as e:
-                    # Only report JSON errors for MCP-related files
-                    if self._is_mcp_related_file(json_file):
-                        self.errors.append(f"{json_file}: Invalid JSON - {e}")
-                        all_valid = False
-                except Exception as e:
-                    if self._is_mcp_related_file(json_file):
-                        self.errors.append(f"{json_file}: Error reading file - {e}")
-                        all_valid = False
-
-        # Find Python files with MCP tools
-        python_files = list(directory.rglob("*.py"))
-        for py_file in python_files:
-            if self._should_validate_python(py_file):
-                try:
-                    with open(py_file, 'r', encoding='utf-8') as f:
-                        code = f.read()
-
-                    if self._contains_mcp_tools(code):
-                        found_mcp_files = True
-                        if not self.validate_mcp_tool_function(code, str(py_file)):
-                            all_valid = False
-
-                except Exception as e:
-                    self.errors.append(f"{py_file}: Error reading file - {e}")
-                    all_valid = False
+        # Results are cached per path, mtime and size; only files seen in this run are written
+        # back, so deleted or modified files drop out of the cache
+        cache_path = directory / _CACHE_FILE
+        cache = self._load_cache(cache_path)
+        fresh_cache: Dict[str, Any] = {}
+
+        # First pass: cache lookups; misses are validated together below
+        entries = []
+        pending = []
+        for kind, entry in self._walk(str(directory)):
+            try:
+                stat = entry.stat()
+                key = f"{entry.path}:{stat.st_mtime_ns}:{stat.st_size}"
+            except OSError:
+                key = None
+            result = cache.get(key) if key else None
+            if result is None:
+                # Plain path strings, since DirEntry objects can't be sent to worker processes
+                pending.append((kind, entry.path))
+            entries.append((key, result))
+
+        # Files are independent, so cold runs fan out across processes; small batches stay
+        # in-process where pool startup would cost more than it saves
+        kinds = [kind for kind, _ in pending]
+        paths = [file_path for _, file_path in pending]
+        if len(pending) < _PARALLEL_MIN_FILES:
+            validated = map(_validate_file_worker, kinds, paths)
+        else:
+            with ProcessPoolExecutor() as executor:
+                validated = list(executor.map(_validate_file_worker, kinds, paths, chunksize=_PARALLEL_CHUNKSIZE))
+        validated = iter(validated)
+
+        # Second pass: merge in walk order so the report order doesn't depend on scheduling
+        for key, result in entries:
+            if result is None:
+                result = next(validated)
+            self.errors.extend(result["errors"])
+            self.warnings.extend(result["warnings"])
+            if key:
+                fresh_cache[key] = result
+
+            if result["mcp"]:
+                found_mcp_files = True
+            if not result["valid"]:
+                all_valid = False
+
+        self._save_cache(cache_path, fresh_cache)
 
         # If no MCP files found, consider it valid (don't block commits)
         if not found_mcp_files:
@@ -196,64 +380,45 @@ class MCPSchemaValidator:
 
         return all_valid
 
-    def _should_validate_json(self, file_path: Path) -> bool:
-        """Check if JSON file should be validated."""
-        # Skip node_modules, build directories, etc.
-        skip_dirs = {"node_modules", ".next", "build", "dist", "__pycache__", ".git", ".vscode"}
-        return not any(part in skip_dirs for part in file_path.parts)
-
-    def _should_validate_python(self, file_path: Path) -> bool:
-        """Check if Python file should be validated."""
-        # Skip migrations, tests, etc.
-        skip_dirs = {"migrations", "__pycache__", ".git", "node_modules"}
-        skip_files = {"__init__.py"}
-        return (not any(part in skip_dirs for part in file_path.parts) and
-                file_path.name not in skip_files)
-
-    def _is_json_schema(self, data: Dict[str, Any]) -> bool:
-        """Check if JSON data is a JSON Schema."""
-        return "$schema" in data and "json-schema.org" in data["$schema"]
-
-    def _is_openapi_spec(self, data: Dict[str, Any]) -> bool:
-        """Check if JSON data is an OpenAPI specification."""
-        return "openapi" in data or "swagger" in data
+    def _classify(self, data: Any) -> str:
+        """Classify JSON data as "schema" (JSON Schema), "openapi" (OpenAPI/Swagger spec) or "other"."""
+        # Top-level arrays and scalars are valid JSON but never schemas or specs
+        if not isinstance(data, dict):
+            return "other"
+        schema_url = data.get("$schema")
+        if schema_url and "json-schema.org" in schema_url:
+            return "schema"
+        if "openapi" in data or "swagger" in data:
+            return "openapi"
+        return "other"
 
     def _contains_mcp_tools(self, code: str) -> bool:
         """Check if Python code contains MCP tool definitions."""
-        # Look for common MCP patterns
-        mcp_patterns = [
-            r'@tool',
-            r'def.*tool.*\(',
-            r'class.*Tool.*:',
-            r'mcp',
-            r'model.*context.*protocol',
-        ]
-        return any(re.search(pattern, code, re.IGNORECASE) for pattern in mcp_patterns)
+        return _MCP_RE.search(code) is not None
 
     def _is_mcp_related_openapi(self, data: Dict[str, Any]) -> bool:
         """Check if OpenAPI spec is MCP-related."""
         # Look for MCP-specific patterns in the API spec
-        if "info" in data and "title" in data["info"]:
-            title = data["info"]["title"].lower()
-            return "mcp" in title or "model context protocol" in title
-        return False
-
-    def _is_mcp_related_file(self, file_path: Path) -> bool:
+        info = data.get("info")
+        title = info.get("title") if isinstance(info, dict) else None
+        if title is None:
+            return False
+        title = title.lower()
+        return "mcp" in title or "model context protocol" in title
+
+    def _is_mcp_related_file(self, file_path: str) -> bool:
         """Check if file is MCP-related based on path or name."""
-        path_str = str(file_path).lower()
+        path_str = file_path.lower()
         return "mcp" in path_str or "tool" in path_str
 
     def print_results(self) -> None:
         """Print validation results."""
+        # Each section is formatted up front and written in one call rather than one print per line
         if self.errors:
-            print("X ERRORS:")
-            for error in self.errors:
-                print(f"  {error}")
+            sys.stdout.write("X ERRORS:\n" + "".join(f"  {error}\n" for error in self.errors))
 
         if self.warnings:
-            print("! WARNINGS:")
-            for warning in self.warnings:
-                print(f"  {warning}")
+            sys.stdout.write("! WARNINGS:\n" + "".join(f"  {warning}\n" for warning in self.warnings))
 
         if not self.errors and not self.warnings:
             print("✓ All MCP schemas and tools are valid!")
@@ -261,6 +426,13 @@ class MCPSchemaValidator:
             print("! No errors found, but there are warnings to address.")
 
 
+def _validate_file_worker(kind: str, file_path: str) -> Dict[str, Any]:
+    """Validate one file in a fresh validator and return its cacheable result (runs in worker processes)."""
+    validator = MCPSchemaValidator()
+    is_mcp, valid = validator._validate_file(kind, file_path)
+    return {"errors": validator.errors, "warnings": validator.warnings, "mcp": is_mcp, "valid": valid}
+
+
 def main():
     """Main entry point."""
     validator = MCPSchemaValidator()